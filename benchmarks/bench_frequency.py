@@ -0,0 +1,77 @@
+"""
+Frequency table: old pandas value_counts path vs textproc.frequency.
+
+    python benchmarks/bench_frequency.py                 # 10k, 1M, 10M tokens
+    python benchmarks/bench_frequency.py --sizes 10000 1000000
+
+Each path builds the table (word, count, length) sorted by frequency, the
+Word Frequency tab default.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from textproc.frequency import FrequencyTable, encode_tokens  # noqa: E402
+
+
+def synthetic_tokens(n: int, n_types: int = 50_000, seed: int = 316) -> list[str]:
+    """Zipf-distributed tokens over a fixed synthetic vocabulary (deterministic)."""
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i:05d}" for i in range(n_types)])
+    ranks = rng.zipf(1.2, size=n)
+    ranks = (ranks - 1) % n_types
+    return vocab[ranks].tolist()
+
+def pandas_path(tokens: list[str]) -> pd.DataFrame:
+    # the implementation the Word Frequency tab used before textproc.frequency
+    s = pd.Series(tokens, dtype="string")
+    df = s.value_counts().reset_index()
+    df.columns = ["word", "count"]
+    df["length"] = df["word"].astype(str).str.len()
+    return df.sort_values(by=["count", "word"], ascending=[False, True], ignore_index=True)
+
+def counter_path(tokens: list[str]) -> pd.DataFrame:
+    return FrequencyTable.from_counts(Counter(tokens)).sorted().to_frame()
+
+def encoded_path(tokens: list[str]) -> pd.DataFrame:
+    codes, vocab = encode_tokens(tokens)
+    return FrequencyTable.from_codes(codes, vocab).sorted().to_frame()
+
+def timed(fn, tokens, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(tokens)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = [("pandas value_counts", pandas_path), ("Counter backend", counter_path), ("encoded bincount", encoded_path)]
+    print(f"{'tokens':>12}  {'path':<20}  {'seconds':>9}  {'speed-up':>8}")
+    for n in args.sizes:
+        tokens = synthetic_tokens(n)
+        reference = pandas_path(tokens)
+        baseline = None
+        for name, fn in paths:
+            result = fn(tokens)
+            assert result["word"].astype(str).tolist() == reference["word"].astype(str).tolist(), name
+            assert result["count"].tolist() == reference["count"].tolist(), name
+            seconds = timed(fn, tokens, 1 if n >= 5_000_000 else args.repeat)
+            baseline = baseline or seconds
+            print(f"{n:>12,}  {name:<20}  {seconds:>9.4f}  {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Headless benchmark suite for the Text-Processing functions.
+
+Generates deterministic synthetic corpora (English, and Korean-English mixed)
+at several sizes, runs each function on a cold cache, and writes time, peak
+memory and tokens per second as JSON so runs can be compared over time.
+
+    python benchmarks/bench_textproc.py --output bench.json
+    python benchmarks/bench_textproc.py --sizes 1KB 1MB --corpora en
+    python benchmarks/bench_textproc.py --output new.json --compare old.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from textproc import (  # noqa: E402
+    analyze,
+    clear_cache,
+    count_sentences,
+    count_words,
+    remove_line_breaks,
+    tokenize_words,
+    word_frequency_df,
+)
+from textproc.diversity import hdd, mattr, mtld, ttr_family  # noqa: E402
+from textproc.readability import all_scores, readability_features, syllable_count  # noqa: E402
+
+
+SEED = 316
+DEFAULT_SIZES = ["1KB", "10KB", "100KB", "1MB", "10MB", "100MB"]
+UNITS = {"KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+ENGLISH_WORDS = (
+    "the of and to a in is that for it as was with be by on not he this are or his from at which "
+    "but have an they you were her she there been one all we their has would when if so no will "
+    "language learners teacher students reading writing speaking listening vocabulary grammar "
+    "meaning context culture communication classroom assessment feedback motivation identity "
+    "bilingual translanguaging corpus discourse pragmatics phonology morphology syntax semantics "
+    "applied linguistics research method data analysis interaction acquisition proficiency task "
+    "don't it's teacher's can't learners' we're"
+).split()
+
+
+# ----------------------------
+# Synthetic corpora
+# ----------------------------
+def parse_size(label: str) -> int:
+    label = label.strip().upper()
+    for unit, factor in UNITS.items():
+        if label.endswith(unit):
+            return int(float(label[: -len(unit)]) * factor)
+    return int(label)
+
+def _hangul_words(rng: np.random.Generator, n: int) -> list[str]:
+    # 1–3 syllable pseudo-words from the Hangul syllable block
+    lengths = rng.integers(1, 4, size=n)
+    syllables = rng.integers(0xAC00, 0xD7A4, size=int(lengths.sum()))
+    words, start = [], 0
+    for k in lengths:
+        words.append("".join(map(chr, syllables[start:start + k])))
+        start += k
+    return words
+
+def synthetic_corpus(kind: str, size_bytes: int, seed: int = SEED) -> str:
+    """
+    Deterministic text of about size_bytes UTF-8 bytes.
+    - en: Zipf-distributed English words plus rarer generated words
+    - ko-en: the same English stream with ~40% Hangul pseudo-words mixed in
+    Sentences of 5–25 words, paragraphs of 3–8 sentences.
+    """
+    rng = np.random.default_rng(seed)
+    english = np.array(ENGLISH_WORDS + [f"term{i}" for i in range(5000)])
+    korean = np.array(_hangul_words(rng, 5000))
+
+    parts, total = [], 0
+    while total < size_bytes:
+        ranks = rng.zipf(1.3, size=20_000) - 1
+        words = english[ranks % english.size]
+        if kind == "ko-en":
+            use_korean = rng.random(size=ranks.size) < 0.4
+            words = np.where(use_korean, korean[ranks % korean.size], words)
+        words = words.tolist()
+        i = 0
+        paragraph = []
+        while i < len(words):
+            n = int(rng.integers(5, 26))
+            sentence = " ".join(words[i:i + n])
+            paragraph.append(sentence[:1].upper() + sentence[1:] + rng.choice([".", ".", ".", "?", "!"]))
+            i += n
+            if len(paragraph) >= int(rng.integers(3, 9)):
+                block = " ".join(paragraph) + "\n\n"
+                parts.append(block)
+                total += len(block.encode("utf-8"))
+                paragraph = []
+                if total >= size_bytes:
+                    break
+    text = "".join(parts)
+    return text.encode("utf-8")[:size_bytes].decode("utf-8", errors="ignore")
+
+
+# ----------------------------
+# Benchmarked paths
+# ----------------------------
+def ttr_path(text: str) -> None:
+    a = analyze(text)
+    table = a.alpha_table
+    ttr_family(table.n_tokens, len(table))
+    codes, _ = a.alpha_codes
+    mattr(codes, 50)
+    mtld(codes)
+    hdd(table.counts)
+
+def readability_path(text: str) -> None:
+    all_scores(readability_features(analyze(text)))
+
+CASES = {
+    "count_words": count_words,
+    "count_sentences": count_sentences,
+    "remove_line_breaks": remove_line_breaks,
+    "tokenize_words": tokenize_words,
+    "word_frequency_df": word_frequency_df,
+    "analyze": analyze,
+    "ttr": ttr_path,
+    "readability": readability_path,
+}
+
+def _cold(fn, text):
+    # every run starts from empty caches so results do not depend on order
+    clear_cache()
+    syllable_count.cache_clear()
+    fn(text)
+
+def measure(fn, text: str, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _cold(fn, text)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    _cold(fn, text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+# ----------------------------
+# Reporting
+# ----------------------------
+def run_meta() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import pandas as pd
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": SEED,
+    }
+
+def compare(current: list, baseline_path: str, tolerance: float) -> list[str]:
+    """Cases that got slower than baseline by more than tolerance (e.g. 0.2 = 20%)."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            (r["corpus"], r["size_bytes"], r["function"]): r
+            for r in json.load(f)["results"] if "seconds" in r
+        }
+    slower = []
+    for r in current:
+        old = baseline.get((r["corpus"], r["size_bytes"], r["function"]))
+        if old and "seconds" in r and r["seconds"] > old["seconds"] * (1 + tolerance):
+            slower.append(
+                f"{r['function']} [{r['corpus']}, {r['size_bytes']:,} B]: "
+                f"{old['seconds']:.4f}s -> {r['seconds']:.4f}s"
+            )
+    return slower
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="e.g. 1KB 10MB (default: 1KB..100MB)")
+    parser.add_argument("--corpora", nargs="+", default=["en", "ko-en"], choices=["en", "ko-en"])
+    parser.add_argument("--functions", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per case (best is kept)")
+    parser.add_argument("--output", help="write JSON here (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slow-down vs baseline")
+    args = parser.parse_args()
+
+    results = []
+    for kind in args.corpora:
+        for label in args.sizes:
+            size = parse_size(label)
+            text = synthetic_corpus(kind, size)
+            tokens = count_words(text)
+            repeat = 1 if size >= 10 * UNITS["MB"] else args.repeat
+            for name in args.functions:
+                row = {"corpus": kind, "size_bytes": size, "tokens": tokens, "function": name}
+                try:
+                    row.update(measure(CASES[name], text, repeat))
+                    row["tokens_per_sec"] = tokens / row["seconds"] if row["seconds"] else None
+                except Exception as e:  # keep going; record what failed
+                    first_line = (str(e).strip().splitlines() or [""])[0]
+                    row["error"] = f"{type(e).__name__}: {first_line}"
+                results.append(row)
+                print(
+                    f"{kind:>6} {label:>6} {name:<20} "
+                    + (f"{row['seconds']:.4f}s  peak {row['peak_bytes'] / 1e6:.1f} MB" if "seconds" in row else row["error"]),
+                    file=sys.stderr,
+                )
+
+    report = {"meta": run_meta(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if args.compare:
+        slower = compare(results, args.compare, args.tolerance)
+        for line in slower:
+            print(f"SLOWER: {line}", file=sys.stderr)
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import qrcode
 from PIL import Image
 from wordcloud import WordCloud
 import streamlit.components.v1 as components  # For embedding YouTube videos / iframe
-from gtts import gTTS
 import io
+import os
 from streamlit_drawable_canvas import st_canvas
 import random
 
+from textproc.tts import (
+    build_audio_pack,
+    open_audio_cache,
+    pack_items_from_lines,
+    pack_items_from_table,
+    split_sentences,
+    stream_sentences,
+)
+from textproc.wordclouds import cache_stats as wordcloud_cache_stats, render_png as render_wordcloud_png
+
 # Function to create word cloud
 def create_wordcloud(text):
     wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
@@ -176,18 +185,15 @@ with tabs[4]:
         if not wc_text.strip():
             st.warning("Please paste some text first.")
         else:
-            wc = WordCloud(
-                width=1000,
-                height=500,
-                background_color=bg,
-                max_words=max_words,
-                colormap=colormap
-            ).generate(wc_text)
-
-            fig, ax = plt.subplots(figsize=(12, 6))
-            ax.imshow(wc, interpolation="bilinear")
-            ax.axis("off")
-            st.pyplot(fig)
+            # Rendered PNGs are cached per text + settings and shared by all sessions,
+            # so a class generating the same reading's cloud gets it instantly.
+            png = render_wordcloud_png(wc_text, max_words=max_words, background=bg, colormap=colormap)
+            if png is None:
+                st.warning("No words found to draw.")
+            else:
+                st.image(png, use_container_width=True)
+                stats = wordcloud_cache_stats()
+                st.caption(f"Cache: {stats['hits']} reused / {stats['misses']} rendered")
 
 # --- Tab 4: (was tabs[4]) TTS ---
 with tabs[5]:
@@ -198,29 +204,51 @@ with tabs[5]:
         ["Korean", "English (American)", "English (British)", "Russian", "Spanish", "French", "Japanese"]
     )
 
+    lang_codes = {
+        "Korean": ("ko", None),
+        "English (American)": ("en", 'com'),
+        "English (British)": ("en", 'co.uk'),
+        "Russian": ("ru", None),
+        "Spanish": ("es", None),
+        "French": ("fr", None),
+        "Chinese": ("zh-CN", None),
+        "Japanese": ("ja", None)
+    }
+    language_code, tld = lang_codes[language]
+
     tts_button = st.button("Convert Text to Speech")
     if tts_button and text_input:
-        lang_codes = {
-            "Korean": ("ko", None),
-            "English (American)": ("en", 'com'),
-            "English (British)": ("en", 'co.uk'),
-            "Russian": ("ru", None),
-            "Spanish": ("es", None),
-            "French": ("fr", None),
-            "Chinese": ("zh-CN", None),
-            "Japanese": ("ja", None)
-        }
-        language_code, tld = lang_codes[language]
 
-        if tld:
-            tts = gTTS(text=text_input, lang=language_code, tld=tld, slow=False)
+        # Shared MP3 cache: the same text/language is synthesized once for the whole class.
+        # Sentences are synthesized in parallel; the first one plays while the rest arrive.
+        audio_cache = open_audio_cache()
+        n_chunks = len(split_sentences(text_input))
+        player = st.empty()
+        progress = st.progress(0.0, text="Synthesizing...") if n_chunks > 1 else None
+        pieces = []
+        try:
+            for piece in stream_sentences(audio_cache, text_input, language_code, tld=tld, slow=False):
+                pieces.append(piece)
+                if progress is not None:
+                    progress.progress(len(pieces) / n_chunks, text=f"Synthesizing... {len(pieces)}/{n_chunks} sentences")
+                    if len(pieces) == 1:
+                        with player.container():
+                            st.caption("▶️ First sentence (the full passage follows when ready)")
+                            st.audio(piece, format='audio/mp3')
+        except Exception as e:
+            st.error(f"Speech synthesis failed: {e}")
         else:
-            tts = gTTS(text=text_input, lang=language_code, slow=False)
-
-        speech = io.BytesIO()
-        tts.write_to_fp(speech)
-        speech.seek(0)
-        st.audio(speech.getvalue(), format='audio/mp3')
+            if progress is not None:
+                progress.empty()
+            if pieces:
+                player.audio(b"".join(pieces), format='audio/mp3')
+            else:
+                player.warning("Please enter some text first.")
+            tts_stats = audio_cache.stats()
+            st.caption(
+                f"Audio cache: {tts_stats['hits'] + tts_stats['shared']} reused / {tts_stats['misses']} synthesized "
+                f"({tts_stats['files']} files, {tts_stats['bytes'] / 1e6:.1f} MB)"
+            )
 
     st.markdown("---")
     st.caption("🇺🇸 English text: Teacher-designed coding applications create tailored learning experiences, making complex concepts easier to understand through interactive and adaptive tools. They enhance engagement, provide immediate feedback, and support active learning.")
@@ -230,6 +258,70 @@ with tabs[5]:
     st.caption("🇨🇳 Chinese: 由教师设计的编程应用程序为学习者提供个性化的学习体验，通过互动和适应性工具使复杂的概念更容易理解。它们增强学习参与度，提供即时反馈，并支持主动学习。")
     st.caption("🇯🇵 Japanese: 教師が設計したコーディングアプリケーションは、学習者のニーズに合わせた学習体験を提供し、複雑な概念をインタラクティブで適応性のあるツールを通じて理解しやすくします。また、学習への集中力を高め、即時フィードバックを提供し、主体的な学習をサポートします。")
 
+    # ---- Audio pack: one MP3 per flashcard field / word-list line, as a ZIP ----
+    st.markdown("---")
+    st.subheader("📦 Vocabulary audio pack")
+    st.caption(
+        "Audio for every card of a deck (CSV) or every line of a word list, in the language chosen above. "
+        "Items are synthesized in parallel and cached, so if the run is interrupted, "
+        "pressing the button again only synthesizes what is missing."
+    )
+    pack_mode = st.radio("Items from", ["Flashcard CSV", "Word list"], horizontal=True, key="pack_mode")
+    pack_items = []
+    if pack_mode == "Flashcard CSV":
+        pack_file = st.file_uploader("Upload a CSV (e.g. Question, Answer columns)", type=["csv"], key="pack_csv")
+        if pack_file is not None:
+            pack_file.seek(0)
+            pack_source = pack_file
+        else:
+            pack_source = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "CH01_flashcards.csv")
+            st.caption("No file uploaded: using the sample deck `data/CH01_flashcards.csv`.")
+        try:
+            pack_df = pd.read_csv(pack_source, encoding="utf-8-sig")
+        except Exception as e:
+            st.error(f"Could not read the CSV: {e}")
+        else:
+            pack_columns = st.multiselect(
+                "Columns to voice", list(pack_df.columns), default=list(pack_df.columns)[:2], key="pack_columns",
+            )
+            if pack_columns:
+                pack_items = pack_items_from_table(pack_df, pack_columns)
+    else:
+        pack_text = st.text_area("One word or phrase per line", height=150, key="pack_lines")
+        pack_items = pack_items_from_lines(pack_text)
+
+    if st.button(f"🎧 Build audio pack ({len(pack_items)} items)", key="pack_build", disabled=not pack_items):
+        pack_progress = st.progress(0.0, text="Synthesizing...")
+
+        def show_progress(done, total):
+            pack_progress.progress(done / total, text=f"Synthesizing... {done}/{total}")
+
+        pack_zip, pack_stats = build_audio_pack(
+            open_audio_cache(), pack_items, language_code, tld=tld, on_progress=show_progress,
+        )
+        pack_progress.empty()
+        st.session_state["pack_result"] = (pack_zip, pack_stats)
+
+    if "pack_result" in st.session_state:
+        pack_zip, pack_stats = st.session_state["pack_result"]
+        st.success(
+            f"✅ {pack_stats['items'] - len(pack_stats['failed'])}/{pack_stats['items']} items "
+            f"({pack_stats['synthesized']} synthesized, {pack_stats['reused']} from cache) "
+            f"in {pack_stats['seconds']:.1f} s"
+        )
+        if pack_stats["failed"]:
+            st.warning(
+                f"{len(pack_stats['failed'])} item(s) failed (see manifest.csv). "
+                "Press the button again to retry just those."
+            )
+        st.download_button(
+            label="⬇️ Download audio pack (.zip)",
+            data=pack_zip,
+            file_name="audio_pack.zip",
+            mime="application/zip",
+            key="pack_download",
+        )
+
 # --- Tab 6: (was tabs[5]) Drawing ---
 
 
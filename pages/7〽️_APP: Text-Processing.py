@@ -1,69 +1,340 @@
 import streamlit as st
-import re
 import pandas as pd
-import io
+import numpy as np
 import matplotlib.pyplot as plt
 import math
-import openpyxl
-import textstat
+import time
 
 
 # ----------------------------
 # Functions
 # ----------------------------
-def count_words(text: str) -> int:
-    return len(re.findall(r"\w+", text))
-
-def count_sentences(text: str) -> int:
-    # ✅ fixed: no +1
-    return len(re.findall(r"[.!?]+", text))
-
-def remove_line_breaks(text: str) -> str:
-    return re.sub(r"[\r\n]+", " ", text)
-
-def word_frequency_df(text: str, top_n: int | None = None) -> pd.DataFrame:
+# Tokenizing/counting lives in textproc/ (importable without Streamlit).
+# analyze() tokenizes a text once and caches the result by content hash,
+# so switching tabs or touching a widget does not re-tokenize.
+from textproc import (
+    TextAnalysis,
+    analyze,
+    count_corpus,
+    iter_corpus_chunks,
+    iter_document_counts,
+    parse_stop_words,
+    remove_line_breaks,
+    tokenize_words,
+)
+from textproc.frequency import SORT_ALPHA, SORT_FREQUENCY, SORT_LENGTH, FrequencyTable
+from textproc.batch import (
+    TABLE_SUFFIXES,
+    default_workers,
+    iter_file_documents,
+    iter_table_documents,
+    read_table,
+    run_batch,
+)
+from textproc.concordance import MAX_INDEX_TOKENS, build_index_from_chunks, concordance_index, index_from_codes
+from textproc.dispersion import (
+    DEFAULT_PARTS,
+    from_codes as dispersion_from_codes,
+    from_documents as dispersion_from_documents,
+    from_lengths as dispersion_from_lengths,
+)
+from textproc.diversity import diversity_summary, hdd, mattr, mtld, ttr_family
+from textproc.export import available_formats, export_table, table_fingerprint, xlsx_bytes
+from textproc.keyness import LL_CRITICAL, SORT_COLUMNS as KEYNESS_SORT_COLUMNS, compare as compare_keyness
+from textproc.ngrams import RANKINGS as NGRAM_RANKINGS, count_ngrams
+from textproc.linebreaks import PREVIEW_CHARS, UnwrapRules, unwrap_file
+from textproc.segments import MODE_PARAGRAPH, MODE_WINDOW, readability_profile
+from textproc.similarity import find_overlaps
+from textproc.readability import (
+    all_scores,
+    consensus_grade as consensus_grade_of,
+    grade_label,
+    readability_features,
+)
+from textproc.workspace import open_workspace
+from textproc.vocabulary import band_name, cached_lexicon, default_lexicon, profile, profile_row
+
+def download_table(table, file_stem: str, key: str, label: str = "table", sheet_name: str = "data", version=None):
     """
-    - lowercases text for case-insensitive counts
-    - counts word tokens (letters/digits/underscore via \w)
-    - returns DataFrame sorted by frequency desc, then word asc
+    Format picker + download button for one table (DataFrame or column arrays).
+    Files are written in row chunks by textproc.export (no full to_csv() string),
+    only when "Prepare" is pressed; the bytes are kept in session_state until the
+    table (version: settings that determine it, else a content hash) or format changes.
     """
-    cleaned = text.lower()
-    tokens = re.findall(r"\w+", cleaned)
-
-    if not tokens:
-        return pd.DataFrame(columns=["word", "count"])
-
-    s = pd.Series(tokens, dtype="string")
-    freq = s.value_counts().reset_index()
-    freq.columns = ["word", "count"]
-    freq = freq.sort_values(by=["count", "word"], ascending=[False, True], ignore_index=True)
-
-    if top_n is not None:
-        freq = freq.head(top_n)
-
-    return freq
-
-def df_to_excel_bytes(df: pd.DataFrame, sheet_name: str = "word_frequency") -> bytes:
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name)
-    output.seek(0)
-    return output.getvalue()
-
-def tokenize_words(text: str):
+    d1, d2 = st.columns([1, 2])
+    with d1:
+        fmt = st.selectbox("Download format", available_formats(), key=f"{key}__fmt")
+    prepared_id = (fmt, table_fingerprint(table) if version is None else version)
+    prepared = st.session_state.get(f"{key}__prepared")
+    with d2:
+        st.write("")
+        if prepared is None or prepared[0] != prepared_id:
+            if st.button(f"Prepare {label} ({fmt})", key=f"{key}__prepare"):
+                with st.spinner("Writing file..."):
+                    prepared = (prepared_id, *export_table(table, fmt, sheet_name))
+                st.session_state[f"{key}__prepared"] = prepared
+        if prepared is not None and prepared[0] == prepared_id:
+            _, data, ext, mime = prepared
+            st.download_button(
+                label=f"⬇️ Download {label}",
+                data=data,
+                file_name=f"{file_stem}.{ext}",
+                mime=mime,
+                key=key,
+            )
+
+def paged_table(table: FrequencyTable, key: str, with_length: bool = True, annotate=None):
+    """
+    Searchable, paginated view of a (sorted) frequency table.
+    The table stays on the server; prefix search and jump-to-rank are binary
+    searches on its cached index, and only the visible page is sent.
+    annotate: optional function(page DataFrame) -> DataFrame for extra columns.
+    """
+    page_key = f"{key}__page"
+    p1, p2, p3, p4 = st.columns([2, 1, 1, 1])
+    with p1:
+        prefix = st.text_input("Search (word starts with)", key=f"{key}__prefix").strip().lower()
+    with p2:
+        page_size = st.selectbox("Rows per page", [25, 50, 100, 200], index=1, key=f"{key}__size")
+
+    rows = table.prefix_rows(prefix)
+    n_pages = max(1, math.ceil(rows.size / page_size))
+
+    def jump_to_rank():
+        rank = st.session_state[f"{key}__rank"]
+        if rank:
+            pos = int(np.searchsorted(rows, rank - 1))
+            st.session_state[page_key] = min(n_pages, pos // page_size + 1)
+
+    with p3:
+        st.number_input("Jump to rank", min_value=0, max_value=max(1, len(table)), value=0, step=1,
+                        key=f"{key}__rank", on_change=jump_to_rank)
+    # page lives in session_state (set by jump-to-rank, clamped when a search shrinks the list)
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), n_pages)
+    with p4:
+        page = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    visible = rows[(page - 1) * page_size:page * page_size]
+    df = table._take(visible).to_frame(with_length=with_length)
+    df.insert(0, "rank", visible + 1)
+    if annotate is not None:
+        df = annotate(df)
+    if prefix:
+        st.caption(f"{rows.size:,} word(s) starting with “{prefix}”")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+def load_corpus(upload, top_k: int | None = None):
+    """
+    Stream an uploaded .txt/.zip once and keep only the merged counts.
+    Cached per upload in session_state so widget changes do not re-read the file.
+    top_k: approximate word counts in fixed memory (Space-Saving summaries).
+    """
+    cache_key = f"corpus__{upload.file_id}" + (f"__top{top_k}" if top_k else "")
+    if cache_key not in st.session_state:
+        upload.seek(0)
+        with st.spinner("Reading corpus in chunks..."):
+            st.session_state[cache_key] = count_corpus(upload.name, upload, top_k=top_k)
+    return st.session_state[cache_key]
+
+def load_corpus_index(upload):
+    """Suffix-array concordance index for an uploaded corpus (built once per upload)."""
+    cache_key = f"corpus_index__{upload.file_id}"
+    if cache_key not in st.session_state:
+        upload.seek(0)
+        with st.spinner("Indexing corpus..."):
+            st.session_state[cache_key] = build_index_from_chunks(iter_corpus_chunks(upload.name, upload))
+    return st.session_state[cache_key]
+
+def load_workspace_index(subset):
+    """Concordance index for a workspace selection (built once per selection)."""
+    cache_key = f"corpus_index__{subset.key}"
+    if cache_key not in st.session_state:
+        with st.spinner("Indexing saved texts..."):
+            st.session_state[cache_key] = index_from_codes(*subset.word_codes)
+    return st.session_state[cache_key]
+
+def load_dispersion(source, by_document: bool, n_parts: int):
+    """
+    Range / Juilland's D / Gries' DP for every word type, over N equal parts of
+    the text or over documents (workspace selection, uploaded corpus).
+    Cached per source and setting.
     """
-    교육용 기본 토큰화:
-    - 알파벳 단어 + 아포스트로피 포함 (don't, teacher's)
-    - 모두 소문자로 정규화
+    cache_key = f"dispersion__{source_id(source)}__" + ("documents" if by_document else str(n_parts))
+    if cache_key not in st.session_state:
+        with st.spinner("Computing dispersion..."):
+            if not has_token_order(source):
+                # counts-only corpus: one streamed pass, a Counter per file
+                corpus_upload.seek(0)
+                result = dispersion_from_documents(iter_document_counts(corpus_upload.name, corpus_upload))
+            elif by_document:
+                result = dispersion_from_lengths(*source.word_codes, source.doc_words)
+            else:
+                result = dispersion_from_codes(*source.word_codes, n_parts)
+        st.session_state[cache_key] = result
+    return st.session_state[cache_key]
+
+# sort label -> (Dispersion field, natural order ascending?); most evenly spread first
+DISPERSION_SORTS = {
+    "Dispersion: DP (even→clustered)": ("dp", True),
+    "Dispersion: Juilland's D (even→clustered)": ("juilland_d", False),
+    "Dispersion: range (most parts first)": ("range", False),
+}
+
+def dispersion_columns(disp, words) -> dict:
+    """Table columns for the given words (blank D/DP for words not in the dispersion data)."""
+    m = disp.lookup(words)
+    return {"range": m["range"], "Juilland's D": np.round(m["juilland_d"], 3), "DP": np.round(m["dp"], 3)}
+
+def frequency_extras(words, sketch=None, disp=None) -> dict:
+    """Extra Word Frequency columns for the given words: max over-count (approximate counts) and dispersion."""
+    columns = {}
+    if sketch is not None:
+        columns["max over-count"] = sketch.error_of(words)
+    if disp is not None:
+        columns.update(dispersion_columns(disp, words))
+    return columns
+
+def has_token_order(source) -> bool:
+    """Text or workspace selection (token codes kept), not a counts-only corpus."""
+    return hasattr(source, "word_codes")
+
+def is_approximate(source) -> bool:
+    """Corpus counted with top-K summaries (only the most frequent word types kept)."""
+    return not isinstance(source, TextAnalysis) and source.approximate
+
+def source_id(source) -> str:
+    """Stable ID of a tab source (content hash for text / workspace selection, upload ID for a corpus)."""
+    if hasattr(source, "key"):
+        return source.key
+    return f"upload:{corpus_upload.file_id}:{source.top_k or 'exact'}"
+
+def tab_source(label: str, height: int, key: str):
+    """
+    Uploaded corpus / workspace selection if there is one, otherwise analyze() of this tab's text box
+    (incremental against the box's previous text).
+    Returns None when there is nothing to analyze yet.
     """
-    return re.findall(r"[a-zA-Z]+(?:'[a-zA-Z]+)?", text.lower())
+    if corpus is not None:
+        st.info(f"📦 Using {corpus_label}")
+        return corpus
+    text = st.text_area(label, height=height, key=key)
+    if not text.strip():
+        return None
+    # Re-use this box's previous analysis: after an edit only the changed
+    # paragraphs are re-tokenized and applied to the counts as deltas.
+    base_key = f"{key}__analysis"
+    result = analyze(text, base=st.session_state.get(base_key))
+    st.session_state[base_key] = result
+    return result
 
 # ----------------------------
 # Streamlit UI
 # ----------------------------
 st.title("Text Processing Tools")
 
-tabs = st.tabs(["Word Count", "Remove Line Breaks", "Word Frequency", "TTR", "Reading level"])
+# ---- Input source (Word Count / Word Frequency / TTR / Reading level) ----
+source_mode = st.radio(
+    "Input",
+    ["Paste text", "Upload corpus (.txt / .zip)", "Saved workspace"],
+    horizontal=True,
+    key="source_mode",
+)
+corpus = None
+corpus_upload = None
+corpus_label = ""
+workspace = None
+if source_mode == "Upload corpus (.txt / .zip)":
+    corpus_upload = st.file_uploader(
+        "Upload a .txt file or a .zip of .txt files",
+        type=["txt", "zip"],
+        key="corpus_upload",
+    )
+    a1, a2 = st.columns([2, 1])
+    with a1:
+        approx_counts = st.checkbox(
+            "Bounded memory: approximate top-K word counts (for very large corpora)",
+            value=False,
+            key="corpus_approx",
+        )
+    with a2:
+        approx_k = st.number_input(
+            "Word types kept (K)", min_value=500, max_value=200_000, value=10_000, step=500,
+            key="corpus_top_k", disabled=not approx_counts,
+        )
+    if corpus_upload is not None:
+        corpus = load_corpus(corpus_upload, top_k=int(approx_k) if approx_counts else None)
+        types_note = (
+            f"top {len(corpus.word_sketch):,} word types kept (approximate counts)"
+            if corpus.approximate else f"{len(corpus.word_counts):,} word types"
+        )
+        st.success(f"✅ {corpus.documents} document(s), {corpus.word_count:,} words, {types_note}")
+        corpus_label = f"uploaded corpus: **{corpus_upload.name}**"
+elif source_mode == "Saved workspace":
+    # Texts saved once (tokens stored as integer IDs), reused across sessions.
+    workspace = open_workspace()
+    with st.expander("➕ Save texts to the workspace"):
+        w1, w2, w3, w4 = st.columns(4)
+        with w1:
+            ws_title = st.text_input("Title", key="ws_title")
+        with w2:
+            ws_student = st.text_input("Student", key="ws_student")
+        with w3:
+            ws_week = st.text_input("Week", key="ws_week")
+        with w4:
+            ws_genre = st.text_input("Genre", key="ws_genre")
+        ws_text = st.text_area("Text", height=150, key="ws_new_text")
+        ws_files = st.file_uploader(
+            "...or .txt / .zip files (file name = title; the student/week/genre above apply to all)",
+            type=["txt", "zip"], accept_multiple_files=True, key="ws_new_files",
+        )
+        if st.button("💾 Save", key="ws_save"):
+            meta = {"student": ws_student, "week": ws_week, "genre": ws_genre}
+            added = 0
+            if ws_text.strip():
+                added += workspace.add_document(ws_text, title=ws_title, **meta)[1]
+            for f in ws_files or []:
+                f.seek(0)
+                added += workspace.add_documents(iter_file_documents(f.name, f), **meta)
+            st.success(f"Saved {added} new document(s) (texts already in the workspace are skipped).")
+
+    f1, f2, f3 = st.columns(3)
+    with f1:
+        ws_f_week = st.multiselect("Week", workspace.facets("week"), key="ws_f_week")
+    with f2:
+        ws_f_student = st.multiselect("Student", workspace.facets("student"), key="ws_f_student")
+    with f3:
+        ws_f_genre = st.multiselect("Genre", workspace.facets("genre"), key="ws_f_genre")
+    ws_query = st.text_input(
+        "Full-text search (optional)",
+        placeholder='e.g. motivation, "language learning", learn*, identity NOT culture',
+        key="ws_query",
+    )
+
+    ws_docs = workspace.documents(week=ws_f_week, student=ws_f_student, genre=ws_f_genre)
+    if ws_query.strip():
+        try:
+            ws_hits = workspace.search(ws_query, limit=1000)
+            ws_docs = ws_docs[ws_docs["id"].isin(ws_hits["id"])]
+            with st.expander(f"🔍 {len(ws_hits)} search hit(s)"):
+                st.dataframe(ws_hits, use_container_width=True, hide_index=True)
+        except ValueError:
+            st.warning("Search not understood. Use words, \"phrases\", prefix* and AND / OR / NOT.")
+
+    if ws_docs.empty:
+        st.info("No saved documents match. Save some texts above.")
+    else:
+        st.dataframe(ws_docs, use_container_width=True, hide_index=True, height=200)
+        corpus = workspace.subset(ws_docs["id"].tolist())
+        corpus_label = f"workspace selection: **{corpus.documents} document(s)**"
+        st.success(
+            f"✅ {corpus.documents} saved document(s), {corpus.word_count:,} words, "
+            f"{len(corpus.word_table):,} word types"
+        )
+
+tabs = st.tabs([
+    "Word Count", "Remove Line Breaks", "Word Frequency", "TTR", "Reading level", "Batch", "Concordance",
+    "Vocabulary Profile",
+])
 
 # ---- Tab 1: Word Count ----
 with tabs[0]:
@@ -73,11 +344,11 @@ with tabs[0]:
         "This application will display the number of words and sentences in your text. "
         "After pasting your text in the box below, hit 'Control + Enter' key to see the result."
     )
-    user_input = st.text_area("Paste your text here:", height=300, key="wc_text")
+    result = tab_source("Paste your text here:", height=300, key="wc_text")
 
-    if user_input:
-        word_count = count_words(user_input)
-        sentence_count = count_sentences(user_input)
+    if result is not None:
+        word_count = result.word_count
+        sentence_count = result.sentence_count
         st.write("✏️ Here's the text count summary:")
         st.write(f"〽️ **Word Count**: {word_count}")
         st.write(f"〽️ **Sentence Count**: {sentence_count}")
@@ -86,12 +357,67 @@ with tabs[0]:
 with tabs[1]:
     st.header("🔄 Remove Line Breaks")
     st.caption("Paste your text here and see it transformed without line breaks, making it easier to copy without formatting.")
-    user_input = st.text_area("Paste your text here to remove line breaks:", height=300, key="rlb_text")
+    rlb_mode = st.radio("Input", ["Paste text", "Upload .txt file (large texts)"], horizontal=True, key="rlb_mode")
+
+    if rlb_mode == "Paste text":
+        user_input = st.text_area("Paste your text here to remove line breaks:", height=300, key="rlb_text")
 
-    if user_input:
-        processed_text = remove_line_breaks(user_input)
-        st.write("📝 Here's your text without line breaks:")
-        st.text_area("Copy the text below:", processed_text, height=300, key="processed")
+        if user_input:
+            processed_text = remove_line_breaks(user_input)
+            st.write("📝 Here's your text without line breaks:")
+            if len(processed_text) <= 10 * PREVIEW_CHARS:
+                st.text_area("Copy the text below:", processed_text, height=300, key="processed")
+            else:
+                # long texts: a short preview + download instead of echoing it all back
+                st.text_area("Preview (beginning of the text):", processed_text[:PREVIEW_CHARS], height=200, key="processed")
+                st.download_button(
+                    label="⬇️ Download full text (.txt)",
+                    data=processed_text.encode("utf-8"),
+                    file_name="text_without_line_breaks.txt",
+                    mime="text/plain",
+                    key="download_rlb_paste",
+                )
+    else:
+        st.caption(
+            "The file is processed line by line on the server; only a short preview is shown here. "
+            "Handy for text copied out of PDFs (hyphenated line ends, page numbers, running headers)."
+        )
+        rlb_file = st.file_uploader("Upload a .txt file", type=["txt"], key="rlb_file")
+        r1, r2, r3, r4 = st.columns(4)
+        with r1:
+            rlb_dehyphen = st.checkbox("Join hyphenated words", value=True, key="rlb_dehyphen")
+        with r2:
+            rlb_paragraphs = st.checkbox("Keep paragraph breaks", value=True, key="rlb_paragraphs")
+        with r3:
+            rlb_page_numbers = st.checkbox("Remove page numbers", value=True, key="rlb_page_numbers")
+        with r4:
+            rlb_headers = st.checkbox("Remove running headers", value=False, key="rlb_headers",
+                                      help="Short lines that repeat 3+ times (e.g. book title or chapter on every page).")
+
+        if rlb_file is not None:
+            rules = UnwrapRules(
+                dehyphenate=rlb_dehyphen,
+                keep_paragraphs=rlb_paragraphs,
+                strip_page_numbers=rlb_page_numbers,
+                strip_headers=rlb_headers,
+            )
+            cache_id = (rlb_file.file_id, rules)
+            cached = st.session_state.get("rlb__result")
+            if cached is None or cached[0] != cache_id:
+                with st.spinner("Removing line breaks..."):
+                    cached = (cache_id, unwrap_file(rlb_file, rules))
+                st.session_state["rlb__result"] = cached
+            unwrapped, preview = cached[1]
+
+            st.write(f"📝 Done: {len(unwrapped):,} bytes")
+            st.text_area("Preview (beginning of the text):", preview, height=200, key="rlb_preview")
+            st.download_button(
+                label="⬇️ Download cleaned text (.txt)",
+                data=unwrapped,
+                file_name=f"{rlb_file.name.rsplit('.', 1)[0]}_no_line_breaks.txt",
+                mime="text/plain",
+                key="download_rlb_file",
+            )
 
 # ---- Tab 3: Word Frequency (NEW) ----
 with tabs[2]:
@@ -102,11 +428,7 @@ with tabs[2]:
         "You can also draw a bar chart for the most frequent words."
     )
 
-    text_for_freq = st.text_area(
-        "Paste your text here:",
-        height=220,
-        key="freq_text",
-    )
+    freq_source = tab_source("Paste your text here:", height=220, key="freq_text")
 
     stop_words_input = st.text_input(
         "Stop words (comma-separated, optional)",
@@ -114,6 +436,40 @@ with tabs[2]:
         key="stop_words_input",
     )
 
+    # Dispersion: is a word spread over the whole text / class set, or bunched in one place?
+    disp = None
+    by_document = False
+    n_parts = DEFAULT_PARTS
+    e1, e2, e3 = st.columns([1, 1, 1])
+    with e1:
+        show_dispersion = st.checkbox(
+            "Dispersion columns (range, Juilland's D, DP)",
+            value=False,
+            key="freq_dispersion",
+            help="How evenly each word is spread over parts of the text. "
+                 "Juilland's D: 1 = perfectly even, 0 = all in one part. "
+                 "Gries' DP: 0 = even, close to 1 = concentrated in one part.",
+        )
+    if show_dispersion and freq_source is not None:
+        by_document = not has_token_order(freq_source)
+        if hasattr(freq_source, "doc_words"):
+            with e2:
+                by_document = st.radio(
+                    "Parts", ["N equal parts", "Documents"], horizontal=True, key="freq_dispersion_parts",
+                ) == "Documents"
+        if not by_document:
+            with e3:
+                n_parts = st.number_input(
+                    "Number of parts", min_value=2, max_value=100, value=DEFAULT_PARTS, step=1,
+                    key="freq_dispersion_n",
+                )
+        if is_approximate(freq_source):
+            st.caption("Dispersion needs exact counts; turn off the top-K approximation to use it.")
+        elif by_document and freq_source.documents < 2:
+            st.caption("Dispersion over documents needs at least 2 documents.")
+        else:
+            disp = load_dispersion(freq_source, by_document, int(n_parts))
+
     c1, c2, c3, c4 = st.columns([1, 1, 1, 1])
     with c1:
         top_n_table = st.number_input(
@@ -136,83 +492,87 @@ with tabs[2]:
     with c3:
         sort_by = st.selectbox(
             "Sort table by",
-            ["Frequency (high→low)", "Alphabetical (A→Z)", "Word length (long→short)"],
+            ["Frequency (high→low)", "Alphabetical (A→Z)", "Word length (long→short)"]
+            + (list(DISPERSION_SORTS) if disp is not None else []),
             key="freq_sort_by",
         )
     with c4:
         sort_ascending = st.checkbox("Ascending", value=False, key="freq_sort_asc")
 
     # ---- Build frequency table once (used by both table + chart) ----
-    df_freq = pd.DataFrame(columns=["word", "count", "length"])
-
-    if text_for_freq.strip():
-        text_lower = text_for_freq.lower()
-        tokens = re.findall(r"\w+", text_lower)
-
-        # Parse stop words
-        stop_words = set()
-        if stop_words_input.strip():
-            stop_words = {
-                w.strip().lower()
-                for w in stop_words_input.split(",")
-                if w.strip()
-            }
-
-        # Remove stop words
-        if stop_words:
-            tokens = [t for t in tokens if t not in stop_words]
-
-        if not tokens:
+    # FrequencyTable keeps words/counts as arrays; a DataFrame is only made
+    # for the rows actually shown.
+    SORT_KEYS = {
+        "Frequency (high→low)": SORT_FREQUENCY,
+        "Alphabetical (A→Z)": SORT_ALPHA,
+        "Word length (long→short)": SORT_LENGTH,
+    }
+
+    ft = None
+    ngram_table = None
+
+    if freq_source is not None:
+        stop_words = parse_stop_words(stop_words_input)
+
+        # Filtered/sorted tables are kept per settings, so paging and search
+        # reruns reuse the same arrays (and their cached search index).
+        view_id = (
+            source_id(freq_source), tuple(sorted(stop_words)), int(min_count),
+            sort_by, sort_ascending, int(top_n_table),
+            disp is not None and (by_document, int(n_parts)),
+        )
+        cached = st.session_state.get("freq__tables")
+        if cached is None or cached[0] != view_id:
+            ft_all = freq_source.word_table.without(stop_words)
+            ft_min = ft_all.min_count(int(min_count))
+            if sort_by in DISPERSION_SORTS:
+                metric, natural = DISPERSION_SORTS[sort_by]
+                ft_sorted = ft_min.sorted_by(disp.lookup(ft_min.words)[metric], ascending=natural != sort_ascending)
+            else:
+                ft_sorted = ft_min.sorted(SORT_KEYS[sort_by], ascending=sort_ascending)
+            cached = (view_id, ft_all, ft_min, ft_sorted, ft_sorted.head(int(top_n_table)))
+            st.session_state["freq__tables"] = cached
+        _, ft, ft_min, ft_sorted, ft_view = cached
+
+        if not len(ft):
             st.warning("No tokens left after applying stop words.")
         else:
-            s = pd.Series(tokens, dtype="string")
-            df_freq = s.value_counts().reset_index()
-            df_freq.columns = ["word", "count"]
-
-            # ✅ Add word length column
-            df_freq["length"] = df_freq["word"].astype(str).str.len()
-
             # Apply min_count first (so both table and chart reflect it)
-            df_freq = df_freq[df_freq["count"] >= int(min_count)].reset_index(drop=True)
+            ft = ft_min
 
-            if df_freq.empty:
+            if not len(ft):
                 st.warning("All words were filtered out by the minimum frequency setting.")
             else:
-                # ✅ Table sorting (now includes length)
-                if sort_by == "Frequency (high→low)":
-                    # default: count desc, then word asc
-                    df_freq = df_freq.sort_values(
-                        by=["count", "word"],
-                        ascending=[sort_ascending, True],
-                        ignore_index=True,
-                    )
-                elif sort_by == "Alphabetical (A→Z)":
-                    df_freq = df_freq.sort_values(
-                        by=["word", "count"],
-                        ascending=[sort_ascending, False],
-                        ignore_index=True,
-                    )
-                else:  # "Word length (long→short)"
-                    df_freq = df_freq.sort_values(
-                        by=["length", "count", "word"],
-                        ascending=[sort_ascending, False, True],
-                        ignore_index=True,
+                # ---- Table (optionally top N), one page at a time ----
+                table_columns = ft_view.to_columns()
+                sketch = freq_source.word_sketch if is_approximate(freq_source) else None
+
+                st.write(f"✅ Unique words (after filters): **{len(ft)}**")
+                if sketch is not None:
+                    # Space-Saving: count - max over-count <= true count <= count
+                    st.caption(
+                        f"≈ Approximate counts (top {sketch.capacity:,} word types kept). "
+                        f"Each count may be too high by at most its 'max over-count'; "
+                        f"any word not listed occurs at most {sketch.floor:,} times. "
+                        f"{int(sketch.guaranteed().sum()):,} words are certainly more frequent than every unlisted word."
                     )
+                if disp is not None:
+                    parts_note = "documents" if by_document else f"{disp.n_parts} equal parts"
+                    st.caption(f"Dispersion over {parts_note}: range = parts containing the word.")
+                table_columns.update(frequency_extras(table_columns["word"], sketch, disp))
 
-                # ---- Table (optionally top N) ----
-                df_table = df_freq if top_n_table == 0 else df_freq.head(int(top_n_table))
+                def annotate(df):
+                    return df.assign(**frequency_extras(df["word"], sketch, disp))
 
-                st.write(f"✅ Unique words (after filters): **{len(df_freq)}**")
-                st.dataframe(df_table, use_container_width=True, hide_index=True)
+                paged_table(ft_view, key="freq_table", annotate=annotate)
 
-                # ---- CSV download (table content you see) ----
-                csv_data = df_table.to_csv(index=False).encode("utf-8-sig")
-                st.download_button(
-                    label="⬇️ Download CSV (table)",
-                    data=csv_data,
-                    file_name="word_frequency.csv",
-                    mime="text/csv",
+                # ---- Download (table content you see) ----
+                download_table(
+                    table_columns,
+                    file_stem="word_frequency",
                     key="download_freq_csv",
+                    sheet_name="word_frequency",
+                    version=view_id,
                 )
 
                 st.markdown("---")
@@ -230,8 +590,8 @@ with tabs[2]:
                     chart_top_n = st.slider(
                         "Top N for chart",
                         min_value=5,
-                        max_value=min(50, len(df_freq)),
-                        value=min(20, len(df_freq)),
+                        max_value=min(50, len(ft)),
+                        value=min(20, len(ft)),
                         step=1,
                         key="chart_top_n",
                     )
@@ -239,11 +599,7 @@ with tabs[2]:
                     if st.button("Draw bar chart", key="draw_bar_chart"):
                         # Chart stays frequency-based (most common words),
                         # regardless of table sort.
-                        plot_df = df_freq.sort_values(
-                            by=["count", "word"],
-                            ascending=[False, True],
-                            ignore_index=True,
-                        ).head(int(chart_top_n)).copy()
+                        plot_df = ft.most_common(int(chart_top_n)).to_frame()
 
                         plot_df["word"] = plot_df["word"].astype(str).str.slice(0, 35)
 
@@ -259,6 +615,156 @@ with tabs[2]:
     else:
         st.info("Paste some text to generate the frequency table.")
 
+    # ---- N-grams & collocations (same stop words / minimum frequency) ----
+    if has_token_order(freq_source):
+        st.markdown("---")
+        st.subheader("🔗 N-grams & Collocations")
+        st.caption(
+            "Bigrams, trigrams and longer lexical bundles, ranked by frequency or by an association measure. "
+            "For bigrams, a window > 1 also counts word pairs that are up to that many words apart. "
+            "The stop words and minimum frequency above are applied here too."
+        )
+
+        g1, g2, g3, g4 = st.columns([1, 1, 1, 1])
+        with g1:
+            ngram_n = st.selectbox("N-gram size", [2, 3, 4, 5], index=0, key="ngram_n")
+        with g2:
+            ngram_window = st.number_input(
+                "Window (bigrams)", min_value=1, max_value=10, value=1, step=1,
+                key="ngram_window", disabled=ngram_n != 2,
+            )
+        with g3:
+            ngram_rank = st.selectbox("Rank by", list(NGRAM_RANKINGS), key="ngram_rank")
+        with g4:
+            ngram_top = st.number_input("Show top N", min_value=10, max_value=1000, value=50, step=10, key="ngram_top")
+
+        # Counted once per (source, n, window, stop words, min frequency);
+        # rank and top-N changes only re-sort the cached table.
+        codes, vocab = freq_source.word_codes
+        stop_list = sorted(parse_stop_words(stop_words_input))
+        ngram_id = (source_id(freq_source), int(ngram_n), int(ngram_window), tuple(stop_list), int(min_count))
+        cached = st.session_state.get("ngrams__result")
+        if cached is None or cached[0] != ngram_id:
+            stop_ids = np.flatnonzero(np.isin(vocab, stop_list)) if stop_list else None
+            cached = (ngram_id, count_ngrams(
+                codes, len(vocab), n=int(ngram_n), window=int(ngram_window), stop_ids=stop_ids,
+            ).min_count(int(min_count)))
+            st.session_state["ngrams__result"] = cached
+        ngram_table = cached[1]
+
+        if not len(ngram_table):
+            st.info("No n-grams left after the stop words / minimum frequency filters.")
+        else:
+            st.write(f"✅ Distinct {ngram_n}-grams (after filters): **{len(ngram_table)}**")
+            st.dataframe(
+                ngram_table.to_frame(vocab, ngram_rank, int(ngram_top)),
+                use_container_width=True,
+                hide_index=True,
+            )
+    elif freq_source is not None:
+        st.caption("N-grams need the running text, so they are not available for uploaded corpora.")
+
+    # ---- Keyness: target (above) vs a reference text/corpus ----
+    if freq_source is not None:
+        st.markdown("---")
+        st.subheader("⚖️ Keyness (compare with a reference)")
+        st.caption(
+            "Compare the text above (target) with a reference text or corpus, e.g. learner essays vs. a model text. "
+            "Positive log-likelihood = used more in the target; negative = used less. "
+            "The stop words above are removed from both sides."
+        )
+        if is_approximate(freq_source):
+            st.caption("≈ The target uses approximate top-K counts, so only its most frequent words are compared.")
+
+        ref_mode = st.radio(
+            "Reference", ["Paste reference text", "Upload reference (.txt / .zip)"],
+            horizontal=True, key="keyness_ref_mode",
+        )
+        ref_source, ref_id = None, None
+        if ref_mode == "Paste reference text":
+            ref_text = st.text_area("Reference text:", height=160, key="keyness_ref_text")
+            if ref_text.strip():
+                ref_source = analyze(ref_text)
+                ref_id = ref_source.key
+        else:
+            ref_upload = st.file_uploader("Reference file", type=["txt", "zip"], key="keyness_ref_upload")
+            if ref_upload is not None:
+                ref_source = load_corpus(ref_upload)
+                ref_id = f"upload:{ref_upload.file_id}"
+
+        if ref_source is not None:
+            q1, q2, q3, q4 = st.columns([1, 1, 1, 1])
+            with q1:
+                key_threshold = st.selectbox("Significance (LL)", list(LL_CRITICAL), index=0, key="keyness_threshold")
+            with q2:
+                key_direction = st.selectbox(
+                    "Show", ["both", "positive", "negative"],
+                    format_func={"both": "Both", "positive": "Overused in target", "negative": "Underused in target"}.get,
+                    key="keyness_direction",
+                )
+            with q3:
+                key_sort = st.selectbox("Sort by", list(KEYNESS_SORT_COLUMNS), key="keyness_sort")
+            with q4:
+                key_top = st.number_input("Show top N", min_value=10, max_value=2000, value=100, step=10, key="keyness_top")
+
+            # Counting/alignment happens once per (target, reference, stop words);
+            # threshold and sort changes only re-filter the cached arrays.
+            stop_words = parse_stop_words(stop_words_input)
+            target_id = source_id(freq_source)
+            cache_id = (target_id, ref_id, tuple(sorted(stop_words)))
+            cached = st.session_state.get("keyness__result")
+            if cached is None or cached[0] != cache_id:
+                cached = (cache_id, compare_keyness(
+                    freq_source.word_table.without(stop_words),
+                    ref_source.word_table.without(stop_words),
+                ))
+                st.session_state["keyness__result"] = cached
+            keyness = cached[1]
+
+            if not keyness.target_total or not keyness.reference_total:
+                empty_side = "target" if not keyness.target_total else "reference"
+                st.warning(f"The {empty_side} has no words left after the stop words, so there is nothing to compare.")
+            else:
+                rows = keyness.select(LL_CRITICAL[key_threshold], key_direction)
+                st.write(
+                    f"✅ Key words: **{rows.size}** of {len(keyness)} word types "
+                    f"(target {keyness.target_total:,} tokens · reference {keyness.reference_total:,} tokens)"
+                )
+                if rows.size:
+                    st.dataframe(
+                        keyness.to_frame(rows, sort_by=key_sort, top=int(key_top)),
+                        use_container_width=True,
+                        hide_index=True,
+                    )
+
+    # ---- Workbook export: frequency + n-grams + diversity summary ----
+    if ft is not None and len(ft):
+        st.markdown("---")
+        st.subheader("📦 Export workbook")
+        st.caption("One Excel file with the full frequency table, the n-gram table and a lexical diversity summary.")
+
+        workbook_id = (source_id(freq_source), tuple(sorted(stop_words)), int(min_count), sort_by, sort_ascending)
+        if st.button("Prepare workbook", key="prepare_freq_workbook"):
+            sheets = {"frequency": ft_sorted.to_columns()}
+            if ngram_table is not None and len(ngram_table):
+                sheets[f"{ngram_n}-grams"] = ngram_table.to_frame(vocab, ngram_rank)
+            if not is_approximate(freq_source):  # diversity needs every word type
+                codes = freq_source.alpha_codes[0] if has_token_order(freq_source) else None
+                summary = diversity_summary(freq_source.alpha_table.counts, codes)
+                sheets["diversity"] = pd.DataFrame(list(summary.items()), columns=["Metric", "Value"])
+            with st.spinner("Writing workbook..."):
+                st.session_state["freq_workbook"] = (workbook_id, xlsx_bytes(sheets))
+
+        prepared = st.session_state.get("freq_workbook")
+        if prepared is not None and prepared[0] == workbook_id:
+            st.download_button(
+                label="⬇️ Download workbook (.xlsx)",
+                data=prepared[1],
+                file_name="text_analysis.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                key="download_freq_workbook",
+            )
+
 # ---- Tab 4 ----
 
 
@@ -266,7 +772,7 @@ with tabs[3]:
     st.header("📚 Token–Type Ratio (TTR) + Lexical Diversity")
     st.caption("Paste text to compute token/type counts and common lexical diversity indices (case-insensitive).")
 
-    text = st.text_area("Paste your text here:", height=260, key="tts_text")
+    tts_source = tab_source("Paste your text here:", height=260, key="tts_text")
 
     stop_words_input = st.text_input(
         "Stop words (comma-separated, optional)",
@@ -274,13 +780,19 @@ with tabs[3]:
         key="tts_stopwords",
     )
 
-    c1, c2, c3 = st.columns([1, 1, 1])
+    c1, c2, c3, c4 = st.columns([1, 1, 1, 1])
     
     with c1:
         min_count = st.number_input(
             "Minimum frequency (optional filter)",
             1, 9999, 1, 1, key="tts_min_count"
         )
+
+    with c4:
+        mattr_window = st.number_input(
+            "MATTR window (tokens)",
+            10, 500, 50, 10, key="tts_mattr_window"
+        )
     
     with c2:
         show_top = st.slider(
@@ -294,46 +806,52 @@ with tabs[3]:
             5, 50, 10, 5, key="tts_bottomn"
         )
 
-    if text.strip():
+    if tts_source is not None and is_approximate(tts_source):
+        st.warning("Lexical diversity needs every word type; turn off approximate top-K counting for this corpus.")
+    elif tts_source is not None:
         # ---- stop words parse (case-insensitive) ----
-        stop_words = set()
-        if stop_words_input.strip():
-            stop_words = {w.strip().lower() for w in stop_words_input.split(",") if w.strip()}
-
-        # ---- tokenize ----
-        tokens = tokenize_words(text)
+        stop_words = parse_stop_words(stop_words_input)
 
-        # ---- remove stop words ----
-        if stop_words:
-            tokens = [t for t in tokens if t not in stop_words]
+        # ---- counts from the shared analysis (tokenize_words tokens) ----
+        tts_table = tts_source.alpha_table.without(stop_words)
 
-        if not tokens:
+        if not len(tts_table):
             st.warning("No tokens found (or all tokens removed by stop words).")
         else:
-            # ---- frequency table ----
-            freq = pd.Series(tokens).value_counts().reset_index()
-            freq.columns = ["word", "count"]
+            # ---- frequency table (optional filter by min_count) ----
+            tts_table = tts_table.min_count(int(min_count))
 
-            # optional filter by min_count
-            freq = freq[freq["count"] >= int(min_count)].reset_index(drop=True)
-
-            if freq.empty:
+            if not len(tts_table):
                 st.warning("All tokens were filtered out by the minimum frequency setting.")
             else:
-                # reconstruct filtered token list (so TTS indices match filtering)
+                # N and V straight from the filtered counts
                 # (교육용이라 'min_count 필터' 적용 시 지표도 그 기준으로 맞추는 방식)
-                filtered_tokens = []
-                for _, row in freq.iterrows():
-                    filtered_tokens.extend([row["word"]] * int(row["count"]))
-
-                N = len(filtered_tokens)                 # tokens
-                V = int(freq.shape[0])                   # types
+                N = tts_table.n_tokens                   # tokens
+                V = len(tts_table)                       # types
 
                 # ---- common lexical diversity indices ----
-                ttr = V / N
-                root_ttr = V / math.sqrt(N)              # Guiraud
-                cttr = V / math.sqrt(2 * N)              # corrected TTR
-                log_ttr = (math.log(V) / math.log(N)) if (V > 1 and N > 1) else float("nan")
+                div = ttr_family(N, V)
+                ttr = div["ttr"]
+                root_ttr = div["root_ttr"]               # Guiraud
+                cttr = div["cttr"]                       # corrected TTR
+                log_ttr = div["log_ttr"]
+
+                # ---- length-robust indices ----
+                # MATTR/MTLD need token order: keep the filtered types in the
+                # integer-encoded sequence (a mask, no token list rebuild).
+                hd_d = hdd(tts_table.counts)
+                if has_token_order(tts_source):
+                    codes, vocab = tts_source.alpha_codes
+                    keep = np.isin(vocab, tts_table.words)
+                    seq = codes[keep[codes]]
+                    mattr_value = mattr(seq, int(mattr_window))
+                    mtld_value = mtld(seq)
+                else:
+                    # streamed corpus: only counts are kept, so no token order
+                    mattr_value = mtld_value = float("nan")
+
+                def fmt(x):
+                    return "" if math.isnan(x) else round(x, 4)
 
                 # ---- summary table ----
                 summary = pd.DataFrame(
@@ -343,26 +861,26 @@ with tabs[3]:
                         ["TTR = V/N", round(ttr, 4)],
                         ["Root TTR (Guiraud) = V/√N", round(root_ttr, 4)],
                         ["CTTR = V/√(2N)", round(cttr, 4)],
-                        ["Log TTR = log(V)/log(N)", "" if math.isnan(log_ttr) else round(log_ttr, 4)],
+                        ["Log TTR = log(V)/log(N)", fmt(log_ttr)],
+                        [f"MATTR (window = {int(mattr_window)})", fmt(mattr_value)],
+                        ["MTLD (threshold 0.72)", fmt(mtld_value)],
+                        ["HD-D (42-token samples)", fmt(hd_d)],
                     ],
                     columns=["Metric", "Value"],
                 )
 
                 st.subheader("✅ Token–Type Summary")
                 st.caption("📌 Note: A higher TTR reflects greater lexical diversity, while a lower TTR indicates more repetition. Since TTR decreases as text length increases, it should be interpreted with caution, especially when comparing texts of different lengths.")
+                st.caption("📌 MATTR, MTLD and HD-D are much less sensitive to text length, so they are the better choice for comparing texts of different lengths. (MATTR/MTLD need the running text and are left blank for uploaded corpora.)")
                 st.dataframe(summary, use_container_width=True, hide_index=True)
 
                 st.subheader("🌀 Top word frequencies")
-                st.dataframe(freq.head(int(show_top)), use_container_width=True, hide_index=True)
+                st.dataframe(tts_table.most_common(int(show_top)).to_frame(with_length=False), use_container_width=True, hide_index=True)
 
                 st.subheader("📉 Low-frequency words")
 
-                low_freq = (
-                    freq.sort_values("count", ascending=True)
-                        .head(int(show_bottom))
-                        .reset_index(drop=True)
-                )
-                
+                low_freq = tts_table.sorted(ascending=True).head(int(show_bottom)).to_frame(with_length=False)
+
                 st.dataframe(low_freq, use_container_width=True, hide_index=True)
 
 
@@ -373,14 +891,11 @@ with tabs[3]:
 # ---- Tab 5 ----
 # ---- Tab 5 ----
 with tabs[4]:
-    import textstat
-    import math
-
     st.header("📚 Reading Level & Lexical Analyzer")
     st.markdown("""
     This app estimates the complexity of your text using standard readability formulas.  
     Since the official **Lexile®** formula is proprietary, this tool uses  
-    **Flesch–Kincaid** and **Text Standard** scores as educational proxies.
+    **Flesch–Kincaid** and a consensus grade across several formulas as educational proxies.
     """)
 
     # ---------- Helper: Grade interpretation ----------
@@ -425,31 +940,37 @@ with tabs[4]:
         return f"{band}. {note} {caution}"
 
     # Input Section
-    text_input = st.text_area(
+    reading_source = tab_source(
         "Paste your text here (minimum 100 words recommended):",
         height=300,
         key="lexile_text_input",
     )
 
-    if text_input.strip():
+    if reading_source is not None and reading_source.alpha_token_count == 0:
+        st.warning("No words found in this text.")
+    elif reading_source is not None:
         # ----------------------------
-        # Core counts
+        # Core counts (one pass; syllables looked up once per word type)
         # ----------------------------
-        word_count = textstat.lexicon_count(text_input, removepunct=True)
-        sentence_count = textstat.sentence_count(text_input)
+        features = readability_features(reading_source)
+        word_count = features.words
+        sentence_count = features.sentences
 
         # ----------------------------
-        # Readability metrics
+        # Readability metrics (all from the same features)
         # ----------------------------
-        fk_grade = textstat.flesch_kincaid_grade(text_input)
-        consensus_grade = textstat.text_standard(text_input)
+        scores = all_scores(features)
+        fk_grade = scores["Flesch–Kincaid Grade"]
+        consensus_grade = grade_label(consensus_grade_of(scores))
 
         # ----------------------------
         # Lexical Diversity (simple TTR)
         # ----------------------------
-        words = re.findall(r"[a-zA-Z]+(?:'[a-zA-Z]+)?", text_input.lower())
-        unique_words = set(words)
-        ttr = len(unique_words) / len(words) if words else 0
+        n_alpha = reading_source.alpha_token_count
+        if is_approximate(reading_source):
+            ttr = float("nan")  # only the top-K word types were kept
+        else:
+            ttr = len(reading_source.alpha_counts) / n_alpha if n_alpha else 0
 
         # ----------------------------
         # Display Metrics
@@ -468,7 +989,7 @@ with tabs[4]:
                 st.write(grade_hint)
 
         with col2:
-            st.metric("Lexical Diversity", f"{ttr:.2f}")
+            st.metric("Lexical Diversity", "—" if math.isnan(ttr) else f"{ttr:.2f}")
             st.caption("Type–Token Ratio (TTR)")
 
         with col3:
@@ -482,6 +1003,21 @@ with tabs[4]:
         st.subheader("📝 Analysis Summary")
         st.write(f"**Recommended Audience:** {consensus_grade}")
 
+        with st.expander("All readability formulas"):
+            st.dataframe(
+                pd.DataFrame(
+                    [[name, round(score, 2)] for name, score in scores.items()],
+                    columns=["Formula", "Score"],
+                ),
+                use_container_width=True,
+                hide_index=True,
+            )
+            st.caption(
+                f"{word_count} words · {sentence_count} sentences · "
+                f"{features.syllables_per_word:.2f} syllables/word · "
+                f"{features.polysyllables} words with 3+ syllables"
+            )
+
         # Lexile proxy (heuristic)
         lexile_proxy = int((fk_grade * 150) + 150) if fk_grade > 0 else 0
         st.info(
@@ -495,5 +1031,327 @@ with tabs[4]:
             text=f"Text Complexity (relative): {fk_grade:.2f} / 12",
         )
 
+        # ----------------------------
+        # Difficulty profile (per paragraph / window)
+        # ----------------------------
+        if isinstance(reading_source, TextAnalysis):
+            st.divider()
+            st.subheader("📈 Difficulty profile")
+            st.caption(
+                "Grade, sentence length and TTR for each part of the text, so you can see where a reading gets hard. "
+                "Segments are cached, so after an edit only the changed parts are re-scored."
+            )
+            p1, p2 = st.columns(2)
+            with p1:
+                profile_mode = st.radio(
+                    "Split into", [MODE_PARAGRAPH, MODE_WINDOW], horizontal=True, key="rl_profile_mode",
+                    format_func={MODE_PARAGRAPH: "Paragraphs", MODE_WINDOW: "Windows of N words"}.get,
+                )
+            with p2:
+                profile_window = st.number_input(
+                    "Words per window", min_value=50, max_value=2000, value=250, step=50,
+                    key="rl_profile_window", disabled=profile_mode != MODE_WINDOW,
+                )
+
+            seg_df, seg_stats = readability_profile(reading_source.text, profile_mode, int(profile_window))
+            if len(seg_df) < 2:
+                st.info("Only one segment: add paragraph breaks (blank lines) or switch to windows.")
+            else:
+                grades = seg_df["fk_grade"].to_numpy()
+                fig, (ax_heat, ax_line) = plt.subplots(
+                    2, 1, figsize=(10, 3.2), sharex=True, gridspec_kw={"height_ratios": [1, 3]},
+                )
+                ax_heat.imshow(grades[None, :], aspect="auto", cmap="RdYlGn_r", vmin=0, vmax=16,
+                               extent=(0.5, len(grades) + 0.5, 0, 1))
+                ax_heat.set_yticks([])
+                ax_line.plot(seg_df["segment"], grades, marker="o", markersize=3)
+                ax_line.axhline(fk_grade, linestyle="--", linewidth=1, color="gray")
+                ax_line.set_xlabel("Segment")
+                ax_line.set_ylabel("FK grade")
+                plt.tight_layout()
+                st.pyplot(fig)
+
+                st.caption(
+                    f"{seg_stats['segments']} segments ({seg_stats['cached']} from cache) "
+                    f"in {seg_stats['seconds'] * 1000:.0f} ms · dashed line = whole-text grade"
+                )
+                st.write("**Hardest segments**")
+                st.dataframe(
+                    seg_df.nlargest(5, "fk_grade").round(2),
+                    use_container_width=True,
+                    hide_index=True,
+                )
+                with st.expander("All segments"):
+                    st.dataframe(seg_df.round(2), use_container_width=True, hide_index=True)
+
     else:
         st.info("Waiting for text input…")
+
+
+# ---- Tab 6: Batch (many essays at once) ----
+with tabs[5]:
+    st.header("🗂️ Batch Analysis")
+    st.caption(
+        "Upload many essays at once: several .txt files, a .zip of .txt files, "
+        "or a CSV/XLSX with one text per row. Each document gets word/sentence counts, "
+        "TTR-family indices and a Flesch–Kincaid grade; the work is spread across CPU cores."
+    )
+
+    batch_files = st.file_uploader(
+        "Upload documents",
+        type=["txt", "zip", "csv", "xlsx"],
+        accept_multiple_files=True,
+        key="batch_files",
+    )
+
+    if batch_files:
+        table_files = [f for f in batch_files if f.name.lower().endswith(TABLE_SUFFIXES)]
+        text_files = [f for f in batch_files if not f.name.lower().endswith(TABLE_SUFFIXES)]
+
+        # Spreadsheet input: pick the text column (and an optional ID column)
+        tables = []
+        for f in table_files:
+            f.seek(0)
+            df_in = read_table(f.name, f)
+            cols = list(df_in.columns)
+            st.markdown(f"**{f.name}** ({len(df_in)} rows)")
+            b1, b2 = st.columns(2)
+            with b1:
+                text_col = st.selectbox("Text column", cols, key=f"batch_text_col__{f.name}")
+            with b2:
+                id_col = st.selectbox("ID column (optional)", ["(row number)"] + cols, key=f"batch_id_col__{f.name}")
+            tables.append((df_in, text_col, None if id_col == "(row number)" else id_col))
+
+        def batch_documents() -> list:
+            documents = []
+            for f in text_files:
+                f.seek(0)
+                documents.extend(iter_file_documents(f.name, f))
+            for df_in, text_col, id_col in tables:
+                documents.extend(iter_table_documents(df_in, text_col, id_col))
+            return documents
+
+        n_cpu = default_workers()
+        # a slider needs min < max: on a single-CPU machine there is nothing to choose
+        workers = st.slider("Worker processes", 1, n_cpu, n_cpu, 1, key="batch_workers") if n_cpu > 1 else 1
+
+        if st.button("▶️ Run batch analysis", key="batch_run"):
+            documents = batch_documents()
+
+            if not documents:
+                st.warning("No non-empty documents found.")
+            else:
+                with st.spinner(f"Analysing {len(documents)} documents..."):
+                    batch_table, batch_stats = run_batch(documents, workers=int(workers))
+                st.session_state["batch_result"] = (batch_table, batch_stats)
+
+        if "batch_result" in st.session_state:
+            batch_table, batch_stats = st.session_state["batch_result"]
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Documents", batch_stats["documents"])
+            m2.metric("Time (s)", f"{batch_stats['seconds']:.2f}")
+            m3.metric("Throughput", f"{batch_stats['docs_per_sec']:.1f} docs/s")
+
+            st.dataframe(batch_table.round(4), use_container_width=True, hide_index=True)
+            download_table(
+                batch_table,
+                file_stem="batch_analysis",
+                key="download_batch_csv",
+                label="batch results",
+                sheet_name="batch",
+            )
+
+        # ---- Overlap check: near-duplicates and copying from a source ----
+        st.markdown("---")
+        st.subheader("🔁 Overlap & near-duplicate check")
+        st.caption(
+            "Finds submissions that share a large part of their word sequences (3-word chunks by default) "
+            "with each other or with a source reading. Jaccard = shared / all chunks of the pair; "
+            "containment = shared / chunks of the shorter text (high when one copies from the other)."
+        )
+        o1, o2 = st.columns(2)
+        with o1:
+            overlap_threshold = st.slider("Flag pairs at or above", 0.1, 1.0, 0.5, 0.05, key="overlap_threshold")
+        with o2:
+            overlap_n = st.number_input("Words per chunk (n-gram)", min_value=1, max_value=10, value=3, step=1, key="overlap_n")
+        overlap_source = st.text_area("Source reading (optional)", height=120, key="overlap_source")
+
+        if st.button("🔍 Check overlap", key="overlap_run"):
+            documents = batch_documents()
+            if len(documents) < 2 and not overlap_source.strip():
+                st.warning("Need at least two documents (or a source reading).")
+            else:
+                with st.spinner(f"Comparing {len(documents)} documents..."):
+                    start = time.perf_counter()
+                    pairs, overlap_stats = find_overlaps(
+                        documents, threshold=float(overlap_threshold), n=int(overlap_n), source=overlap_source,
+                    )
+                    overlap_stats["seconds"] = time.perf_counter() - start
+                st.session_state["overlap_result"] = (pairs, overlap_stats)
+
+        if "overlap_result" in st.session_state:
+            pairs, overlap_stats = st.session_state["overlap_result"]
+            st.write(
+                f"✅ **{overlap_stats['flagged']}** pair(s) flagged · "
+                f"{overlap_stats['candidates']:,} of {overlap_stats['all_pairs']:,} document pairs compared in detail "
+                f"({overlap_stats['seconds']:.2f} s)"
+            )
+            if not pairs.empty:
+                st.dataframe(pairs, use_container_width=True, hide_index=True)
+                download_table(pairs, file_stem="overlap_pairs", key="download_overlap", label="flagged pairs", sheet_name="overlap")
+    else:
+        st.info("Upload documents to run a batch analysis.")
+
+
+# ---- Tab 7: Concordance (KWIC) ----
+with tabs[6]:
+    st.header("🔎 Concordance (KWIC)")
+    st.caption(
+        "Type a word or phrase to see every occurrence with its left and right context. "
+        "The text is indexed once, so you can try one query after another quickly."
+    )
+
+    kwic_source = tab_source("Paste your text here:", height=220, key="kwic_text")
+
+    k1, k2, k3, k4 = st.columns([2, 1, 1, 1])
+    with k1:
+        kwic_query = st.text_input("Word or phrase", placeholder="e.g., language, in order to", key="kwic_query")
+    with k2:
+        kwic_width = st.number_input("Context (words)", min_value=2, max_value=30, value=8, step=1, key="kwic_width")
+    with k3:
+        kwic_sort = st.selectbox(
+            "Sort lines by",
+            ["Text order", "Left context", "Right context"],
+            key="kwic_sort",
+        )
+    with k4:
+        kwic_limit = st.number_input("Max lines", min_value=50, max_value=5000, value=500, step=50, key="kwic_limit")
+
+    if kwic_source is None:
+        st.info("Paste some text (or upload a corpus) to search it.")
+    elif not kwic_query.strip():
+        st.info("Type a word or phrase to search.")
+    elif is_approximate(kwic_source):
+        st.warning("The concordance needs every token; turn off approximate top-K counting for this corpus.")
+    elif kwic_source.word_count > MAX_INDEX_TOKENS:
+        st.warning(
+            f"The concordance indexes up to {MAX_INDEX_TOKENS:,} tokens; this text has "
+            f"{kwic_source.word_count:,}. Select fewer documents or upload a smaller corpus."
+        )
+    else:
+        if isinstance(kwic_source, TextAnalysis):
+            kwic_index = concordance_index(kwic_source)
+        elif workspace is not None:
+            kwic_index = load_workspace_index(kwic_source)
+        else:
+            kwic_index = load_corpus_index(corpus_upload)
+
+        hits = kwic_index.find(kwic_query)
+        sort_key = {"Text order": "position", "Left context": "left", "Right context": "right"}[kwic_sort]
+        lines = kwic_index.kwic(kwic_query, width=int(kwic_width), sort_by=sort_key, limit=int(kwic_limit))
+
+        st.write(f"✅ **{hits.size}** hit(s) for “{kwic_query.strip()}” in {len(kwic_index):,} tokens")
+        if hits.size > len(lines):
+            st.caption(f"Showing the first {len(lines)} lines.")
+        if not lines.empty:
+            st.dataframe(lines, use_container_width=True, hide_index=True)
+            st.download_button(
+                label="⬇️ Download CSV (concordance)",
+                data=lines.to_csv(index=False).encode("utf-8-sig"),
+                file_name="concordance.csv",
+                mime="text/csv",
+                key="download_kwic_csv",
+            )
+
+
+# ---- Tab 8: Vocabulary Profile (frequency bands) ----
+with tabs[7]:
+    st.header("🧮 Vocabulary Profile")
+    st.caption(
+        "Classifies every word into frequency bands (e.g. K1, K2, AWL) from word lists and reports "
+        "how much of the text each band covers, plus the off-list words. "
+        "Possessives are matched by their base word (teacher's → teacher)."
+    )
+
+    list_mode = st.radio(
+        "Word lists", ["Built-in (data/wordlists)", "Upload my own (.txt, one file per band)"],
+        horizontal=True, key="vp_list_mode",
+    )
+    if list_mode.startswith("Built-in"):
+        lexicon = default_lexicon()
+    else:
+        list_files = st.file_uploader(
+            "Band lists (files are used in file-name order, e.g. 1_K1.txt, 2_K2.txt, 3_AWL.txt)",
+            type=["txt"], accept_multiple_files=True, key="vp_list_files",
+        )
+        lexicon = cached_lexicon({
+            band_name(f.name): f.getvalue().decode("utf-8-sig", errors="replace")
+            for f in sorted(list_files or [], key=lambda f: f.name)
+        })
+
+    if not lexicon.names:
+        st.warning("No word lists found. Add .txt lists to data/wordlists or upload your own.")
+    else:
+        sizes = np.bincount(lexicon.bands, minlength=len(lexicon.names))
+        st.caption("Bands: " + " · ".join(f"**{n}** ({c:,} words)" for n, c in zip(lexicon.names, sizes)))
+
+        vp_source = tab_source("Paste your text here:", height=220, key="vp_text")
+
+        if vp_source is not None and is_approximate(vp_source):
+            st.warning("The profile needs every word type; turn off approximate top-K counting for this corpus.")
+        elif vp_source is not None and vp_source.alpha_token_count == 0:
+            st.warning("No words found in this text.")
+        elif vp_source is not None:
+            vp = profile(vp_source.alpha_table, lexicon)
+            vp_df = vp.to_frame()
+
+            st.subheader("✅ Band coverage")
+            st.dataframe(vp_df, use_container_width=True, hide_index=True)
+
+            fig, ax = plt.subplots(figsize=(8, 0.5 * len(vp_df) + 1.5))
+            ax.barh(vp_df["band"][::-1], vp_df["token %"][::-1])
+            ax.set_xlabel("% of tokens")
+            ax.set_xlim(0, 100)
+            plt.tight_layout()
+            st.pyplot(fig)
+
+            off_list = vp.band_words(lexicon.off_list)
+            st.subheader(f"📌 Off-list words ({len(off_list):,} types)")
+            if len(off_list):
+                vp_top = st.number_input("Show top N", min_value=10, max_value=5000, value=100, step=10, key="vp_off_top")
+                st.dataframe(off_list.head(int(vp_top)).to_frame(with_length=False), use_container_width=True, hide_index=True)
+                download_table(off_list.to_columns(with_length=False), file_stem="off_list_words", key="download_vp_off", label="off-list words", sheet_name="off_list")
+        else:
+            st.info("Paste some text (or upload a corpus) to profile it.")
+
+        # ---- Class set: one row per essay ----
+        st.markdown("---")
+        st.subheader("🗂️ Profile a class set")
+        vp_files = st.file_uploader(
+            "Essays (.txt, .zip of .txt, or a CSV/XLSX with one text per row)",
+            type=["txt", "zip", "csv", "xlsx"], accept_multiple_files=True, key="vp_files",
+        )
+        if vp_files:
+            documents = []
+            for f in vp_files:
+                f.seek(0)
+                if f.name.lower().endswith(TABLE_SUFFIXES):
+                    df_in = read_table(f.name, f)
+                    text_col = st.selectbox(f"Text column ({f.name})", list(df_in.columns), key=f"vp_text_col__{f.name}")
+                    documents.extend(iter_table_documents(df_in, text_col))
+                else:
+                    documents.extend(iter_file_documents(f.name, f))
+
+            if documents:
+                # types + counts per essay, then one searchsorted against the compiled lists
+                start = time.perf_counter()
+                class_df = pd.DataFrame([
+                    profile_row(doc_id, FrequencyTable.from_tokens(tokenize_words(text)), lexicon)
+                    for doc_id, text in documents
+                ])
+                elapsed = time.perf_counter() - start
+                st.caption(f"{len(documents)} documents in {elapsed * 1000:.0f} ms ({elapsed * 1000 / len(documents):.1f} ms per document)")
+                st.dataframe(class_df, use_container_width=True, hide_index=True)
+                download_table(class_df, file_stem="vocabulary_profile", key="download_vp_class", label="class profile", sheet_name="profile")
+            else:
+                st.warning("No non-empty documents found.")
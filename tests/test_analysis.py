@@ -0,0 +1,12 @@
+from textproc.analysis import LRUCache
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache(2)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)          # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "entries": 2}
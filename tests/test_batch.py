@@ -0,0 +1,28 @@
+import io
+import zipfile
+
+import pandas as pd
+
+from textproc.batch import iter_file_documents, iter_table_documents
+
+
+def zip_bytes(members: dict) -> io.BytesIO:
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as zf:
+        for name, text in members.items():
+            zf.writestr(name, text)
+    out.seek(0)
+    return out
+
+def test_empty_txt_file_is_skipped():
+    assert list(iter_file_documents("empty.txt", io.BytesIO(b""))) == []
+    assert list(iter_file_documents("blank.txt", io.BytesIO(b"\xef\xbb\xbf \n\n"))) == []
+    assert list(iter_file_documents("a.txt", io.BytesIO(b"Hello."))) == [("a.txt", "Hello.")]
+
+def test_empty_zip_members_are_skipped():
+    raw = zip_bytes({"a.txt": "First essay.", "empty.txt": "", "blank.txt": "  \n", "b.txt": "Second essay."})
+    assert [doc_id for doc_id, _ in iter_file_documents("essays.zip", raw)] == ["a.txt", "b.txt"]
+
+def test_empty_table_cells_are_skipped():
+    df = pd.DataFrame({"text": ["One.", "", None, "Two."]})
+    assert [doc_id for doc_id, _ in iter_table_documents(df, "text")] == ["1", "4"]
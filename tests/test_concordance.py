@@ -0,0 +1,22 @@
+from textproc.analysis import analyze
+from textproc.concordance import build_index_from_chunks, concordance_index
+
+
+TEXT = "The cat sat.\n\nA Dog, and the cat!\n\n\nThe end of the cat"
+
+
+def test_lines_show_the_original_text():
+    index = concordance_index(analyze(TEXT))
+    assert len(index) == analyze(TEXT).word_count
+    lines = index.kwic("the cat", width=2)
+    assert lines["position"].tolist() == [0, 6, 11]
+    assert lines["keyword"].tolist() == ["The cat", "the cat", "the cat"]
+    assert lines["left"].tolist() == ["", "Dog, and", "end of"]
+    assert lines["right"].tolist() == ["sat. A", "! The end", ""]
+
+def test_chunk_index_matches_text_index():
+    text_index = concordance_index(analyze(TEXT))
+    chunk_index = build_index_from_chunks(TEXT.split("\n\n"))
+    for query in ("cat", "the", "the cat", "dog and", "missing"):
+        assert text_index.find(query).tolist() == chunk_index.find(query).tolist()
+    assert chunk_index.kwic("dog", width=1)["left"].tolist() == ["a"]
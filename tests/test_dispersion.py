@@ -0,0 +1,27 @@
+from collections import Counter
+
+import numpy as np
+
+from textproc.dispersion import from_codes, from_documents
+
+
+def test_even_and_clustered_words():
+    # 4 equal parts of 2 tokens: "a" once in every part, "b" only in the last part
+    vocab = np.array(["a", "b", "c", "unused"])
+    codes = np.array([0, 2, 0, 2, 0, 2, 0, 1])
+    disp = from_codes(codes, vocab, n_parts=4)
+    assert disp.words.tolist() == ["a", "b", "c"]
+    m = disp.lookup(["a", "b", "missing"])
+    assert m["range"].tolist() == [4, 1, 0]
+    np.testing.assert_allclose(m["juilland_d"][:2], [1.0, 0.0])
+    np.testing.assert_allclose(m["dp"][:2], [0.0, 0.75])
+    assert np.isnan(m["dp"][2])
+
+def test_documents_match_lengths():
+    docs = [Counter({"a": 2, "b": 1}), Counter({"a": 1}), Counter({"c": 3})]
+    disp = from_documents(docs)
+    assert disp.n_parts == 3
+    assert disp.range.tolist() == [2, 1, 1]
+    # "c": all 3 of its tokens in the last document, which holds 3 of the 7 tokens
+    np.testing.assert_allclose(disp.lookup(["c"])["dp"], [1 - 3 / 7])
+    assert not len(from_documents([]).words)
@@ -0,0 +1,26 @@
+from collections import Counter
+
+import numpy as np
+
+from textproc.frequency import FrequencyTable
+from textproc.keyness import compare
+
+
+def table(text: str) -> FrequencyTable:
+    return FrequencyTable.from_counts(Counter(text.split()))
+
+
+def test_overused_word_is_positive():
+    keyness = compare(table("cat cat cat cat dog"), table("dog dog dog dog cat"))
+    ll = dict(zip(keyness.words.tolist(), keyness.log_likelihood.tolist()))
+    assert ll["cat"] > 0 > ll["dog"]
+    assert keyness.target_total == keyness.reference_total == 5
+
+def test_empty_side_gives_empty_table():
+    for target, reference in [("", "a b"), ("a b", ""), ("", "")]:
+        with np.errstate(all="raise"):
+            keyness = compare(table(target), table(reference))
+        assert len(keyness) == 0
+        assert keyness.select().size == 0
+        assert keyness.to_frame(keyness.select()).empty
+    assert compare(table("a b"), table("")).target_total == 2
@@ -0,0 +1,32 @@
+import math
+
+from textproc.readability import consensus_grade, grade_label, grade_suffix
+
+
+def test_grade_suffix():
+    assert [grade_suffix(n) for n in (0, 1, 2, 3, 4, 11, 12, 13, 21, 22, 23, 111)] == [
+        "th", "st", "nd", "rd", "th", "th", "th", "th", "st", "nd", "rd", "th",
+    ]
+
+def test_grade_label_small_grades_are_clamped():
+    assert grade_label(1) == "0th and 1st grade"
+    assert grade_label(0) == "0th and 1st grade"
+    assert grade_label(-3) == "0th and 1st grade"
+    assert grade_label(2) == "1st and 2nd grade"
+    assert grade_label(3) == "2nd and 3rd grade"
+    assert grade_label(12) == "11th and 12th grade"
+
+def test_grade_label_large_grades_are_clamped():
+    assert grade_label(18) == "17th and 18th grade"
+    assert grade_label(25) == "17th and 18th grade"
+
+def test_empty_text_has_no_grade():
+    nan = float("nan")
+    scores = {"Flesch–Kincaid Grade": nan, "Flesch Reading Ease": nan}
+    assert consensus_grade(scores) is None
+    assert "grade" not in grade_label(consensus_grade(scores))
+
+def test_consensus_grade_votes():
+    scores = {"Flesch–Kincaid Grade": 7.4, "Gunning Fog": 7.6, "Flesch Reading Ease": 75.0}
+    assert consensus_grade(scores) == 7
+    assert not math.isnan(consensus_grade(scores))
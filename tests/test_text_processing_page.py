@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages", "7〽️_APP: Text-Processing.py")
+ESSAYS = [
+    ("a.txt", b"Students read the text. They discuss it in class.", "text/plain"),
+    ("b.txt", b"Language learning takes time. Practice helps a lot.", "text/plain"),
+]
+
+
+def run_batch_tab() -> AppTest:
+    at = AppTest.from_file(PAGE, default_timeout=60)
+    at.run()
+    [uploader] = [u for u in at.get("file_uploader") if u.key == "batch_files"]
+    uploader.set_value(ESSAYS)
+    at.run()
+    return at
+
+def test_batch_tab_on_single_cpu(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    at = run_batch_tab()
+    assert not at.exception
+    assert not [s for s in at.slider if s.key == "batch_workers"]
+
+def test_batch_tab_worker_slider(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    at = run_batch_tab()
+    assert not at.exception
+    assert [s.max for s in at.slider if s.key == "batch_workers"] == [4]
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from textproc.tts import ORIGIN_CACHED, ORIGIN_SHARED, ORIGIN_SYNTHESIZED, AudioCache, SilenceBackend, audio_key
+
+
+def test_second_fetch_reads_from_disk(tmp_path):
+    cache = AudioCache(str(tmp_path), backend=SilenceBackend())
+    data, origin = cache.fetch("Hello there.", "en")
+    assert origin == ORIGIN_SYNTHESIZED
+    assert cache.fetch("Hello there.", "en") == (data, ORIGIN_CACHED)
+    assert cache.backend.calls == 1
+
+def test_concurrent_fetches_synthesize_once(tmp_path):
+    backend = SilenceBackend()
+    started, release = threading.Event(), threading.Event()
+    synthesize = backend.synthesize
+
+    def slow_synthesize(*args):
+        started.set()
+        release.wait(5)
+        return synthesize(*args)
+
+    backend.synthesize = slow_synthesize
+    cache = AudioCache(str(tmp_path), backend=backend)
+    results = []
+    owner = threading.Thread(target=lambda: results.append(cache.fetch("Hi.", "en")))
+    owner.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: results.append(cache.fetch("Hi.", "en")))
+    waiter.start()
+    while cache.stats()["shared"] == 0:
+        time.sleep(0.001)
+    release.set()
+    owner.join(), waiter.join()
+    assert sorted(origin for _, origin in results) == [ORIGIN_SHARED, ORIGIN_SYNTHESIZED]
+    assert backend.calls == 1
+
+def test_file_stored_after_the_first_check_is_not_synthesized_again(tmp_path):
+    # the synthesizing caller finishes between our unlocked check and taking the lock
+    cache = AudioCache(str(tmp_path), backend=SilenceBackend())
+    key = audio_key("Hi.", "en")
+
+    class LateSizes(dict):
+        checked = False
+
+        def __contains__(self, k):
+            if not self.checked:
+                self.checked = True
+                cache._store(key, b"mp3")
+                return False
+            return dict.__contains__(self, k)
+
+    cache._sizes = LateSizes()
+    assert cache.fetch("Hi.", "en") == (b"mp3", ORIGIN_CACHED)
+    assert cache.backend.calls == 0
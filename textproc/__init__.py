@@ -0,0 +1,27 @@
+"""
+Text analysis helpers shared by the Text-Processing app.
+
+Kept free of Streamlit so the same functions can be imported headless.
+"""
+from .analysis import (
+    LRUCache,
+    TextAnalysis,
+    analyze,
+    clear_cache,
+    count_sentences,
+    count_words,
+    parse_stop_words,
+    remove_line_breaks,
+    text_key,
+    tokenize_words,
+    word_frequency_df,
+)
+from .corpus import (
+    CorpusStats,
+    count_corpus,
+    iter_corpus_chunks,
+    iter_document_counts,
+    iter_text_chunks,
+)
+from .frequency import FrequencyTable, encode_tokens
+from .sketch import SpaceSaving
@@ -0,0 +1,303 @@
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain
+
+import pandas as pd
+
+from .frequency import FrequencyTable, encode_tokens
+from .readability import ReadabilityFeatures, features_from_counts, syllable_count
+
+
+# ----------------------------
+# Tokenizers (shared by every tab)
+# ----------------------------
+WORD_RE = re.compile(r"\w+")
+ALPHA_WORD_RE = re.compile(r"[a-zA-Z]+(?:'[a-zA-Z]+)?")
+SENTENCE_RE = re.compile(r"[^.!?]*[.!?]+")
+LINE_BREAK_RE = re.compile(r"[\r\n]+")
+
+
+def count_words(text: str) -> int:
+    return len(WORD_RE.findall(text))
+
+def count_sentences(text: str) -> int:
+    # one sentence per run of terminal punctuation (no +1)
+    return len(re.findall(r"[.!?]+", text))
+
+def remove_line_breaks(text: str) -> str:
+    return LINE_BREAK_RE.sub(" ", text)
+
+def tokenize_words(text: str):
+    """
+    교육용 기본 토큰화:
+    - 알파벳 단어 + 아포스트로피 포함 (don't, teacher's)
+    - 모두 소문자로 정규화
+    """
+    return ALPHA_WORD_RE.findall(text.lower())
+
+def word_frequency_df(text: str, top_n: int | None = None) -> pd.DataFrame:
+    """
+    - lowercases text for case-insensitive counts
+    - counts word tokens (letters/digits/underscore via \\w)
+    - returns DataFrame sorted by frequency desc, then word asc
+    """
+    table = analyze(text).word_table
+    if not len(table):
+        return pd.DataFrame(columns=["word", "count"])
+
+    table = table.sorted() if top_n is None else table.most_common(top_n)
+    return table.to_frame(with_length=False)
+
+def parse_stop_words(raw: str) -> set[str]:
+    """Comma-separated stop words -> lowercase set (empty entries dropped)."""
+    return {w.strip().lower() for w in raw.split(",") if w.strip()}
+
+
+# ----------------------------
+# Paragraph-level pieces
+# ----------------------------
+PARAGRAPH_BREAK_RE = re.compile(r"\n[ \t]*(?:\r?\n)+")
+
+
+@dataclass(frozen=True)
+class Paragraph:
+    """Tokens and counts for one paragraph (cached by its own hash)."""
+    key: str
+    words: tuple
+    word_counts: Counter
+    alpha_tokens: tuple
+    alpha_counts: Counter
+    sentence_spans: tuple   # offsets relative to the paragraph start
+
+    @cached_property
+    def features(self) -> ReadabilityFeatures:
+        return features_from_counts(self.alpha_counts, len(self.sentence_spans))
+
+
+def paragraph_bounds(text: str) -> list[tuple[int, int]]:
+    """(start, end) of each paragraph; paragraphs are separated by blank lines."""
+    bounds = []
+    start = 0
+    for m in PARAGRAPH_BREAK_RE.finditer(text):
+        bounds.append((start, m.start()))
+        start = m.end()
+    bounds.append((start, len(text)))
+    return bounds
+
+def _tokenize_paragraph(chunk: str, key: str) -> Paragraph:
+    lowered = chunk.lower()
+    words = tuple(WORD_RE.findall(lowered))
+    alpha_tokens = tuple(ALPHA_WORD_RE.findall(lowered))
+    return Paragraph(
+        key=key,
+        words=words,
+        word_counts=Counter(words),
+        alpha_tokens=alpha_tokens,
+        alpha_counts=Counter(alpha_tokens),
+        sentence_spans=tuple(m.span() for m in SENTENCE_RE.finditer(chunk)),
+    )
+
+
+# ----------------------------
+# Shared analysis result
+# ----------------------------
+@dataclass(frozen=True)
+class TextAnalysis:
+    """
+    Everything the tabs need from one pasted text, tokenized once.
+
+    - paragraphs: (offset, Paragraph) pairs; only new paragraphs are tokenized
+    - word_counts: lowercase \\w+ token counts (Word Count, Word Frequency)
+    - alpha_counts: tokenize_words() token counts (TTR, Reading level)
+    - words / alpha_tokens / sentence_spans: full-text sequences (first use)
+    - features: readability totals summed from paragraphs (first use)
+    - syllables: syllables per alpha word type (first use)
+    - alpha_codes / word_codes: (codes, vocab) integer encodings (first use)
+    """
+    key: str
+    text: str
+    paragraphs: tuple
+    word_counts: Counter
+    alpha_counts: Counter
+
+    @property
+    def word_count(self) -> int:
+        return sum(len(p.words) for _, p in self.paragraphs)
+
+    @property
+    def sentence_count(self) -> int:
+        return sum(len(p.sentence_spans) for _, p in self.paragraphs)
+
+    @property
+    def alpha_token_count(self) -> int:
+        return sum(len(p.alpha_tokens) for _, p in self.paragraphs)
+
+    @property
+    def char_count(self) -> int:
+        return len(self.text)
+
+    @cached_property
+    def words(self) -> tuple:
+        return tuple(chain.from_iterable(p.words for _, p in self.paragraphs))
+
+    @cached_property
+    def alpha_tokens(self) -> tuple:
+        return tuple(chain.from_iterable(p.alpha_tokens for _, p in self.paragraphs))
+
+    @cached_property
+    def sentence_spans(self) -> tuple:
+        return tuple(
+            (offset + s, offset + e)
+            for offset, p in self.paragraphs
+            for s, e in p.sentence_spans
+        )
+
+    @cached_property
+    def features(self) -> ReadabilityFeatures:
+        return sum((p.features for _, p in self.paragraphs), ReadabilityFeatures())
+
+    @cached_property
+    def syllables(self) -> dict:
+        return {w: syllable_count(w) for w in self.alpha_counts}
+
+    @cached_property
+    def alpha_codes(self) -> tuple:
+        return encode_tokens(self.alpha_tokens)
+
+    @cached_property
+    def word_codes(self) -> tuple:
+        return encode_tokens(self.words)
+
+    @cached_property
+    def word_table(self) -> FrequencyTable:
+        return FrequencyTable.from_counts(self.word_counts)
+
+    @cached_property
+    def alpha_table(self) -> FrequencyTable:
+        return FrequencyTable.from_counts(self.alpha_counts)
+
+
+def text_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU (Streamlit serves sessions from several threads).
+    Counts hits and misses of get(); stats() reads them under the same lock.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._data: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None:
+                self._data.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+            return hit
+
+    def put(self, key: str, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        """hits / misses of get() since creation, entries currently held."""
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "entries": len(self._data)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Bounded LRUs keyed by content hash. Module-level, so they are shared by every
+# session/rerun served by this Streamlit process.
+CACHE_SIZE = 64
+PARAGRAPH_CACHE_SIZE = 4096
+_cache = LRUCache(CACHE_SIZE)
+_paragraph_cache = LRUCache(PARAGRAPH_CACHE_SIZE)
+
+def _paragraph(chunk: str) -> Paragraph:
+    key = text_key(chunk)
+    para = _paragraph_cache.get(key)
+    if para is None:
+        para = _tokenize_paragraph(chunk, key)
+        _paragraph_cache.put(key, para)
+    return para
+
+def _apply_delta(base: TextAnalysis, paragraphs: list) -> tuple[Counter, Counter]:
+    """
+    Counts for the new paragraph list from base's counts:
+    subtract paragraphs that disappeared, add the ones that are new.
+    Work is proportional to the changed paragraphs (plus one copy of the counts).
+    """
+    old = Counter(p.key for _, p in base.paragraphs)
+    new = Counter(p.key for _, p in paragraphs)
+    by_key = {p.key: p for _, p in base.paragraphs}
+    by_key.update((p.key, p) for _, p in paragraphs)
+
+    word_counts = base.word_counts.copy()
+    alpha_counts = base.alpha_counts.copy()
+    for key, n in (old - new).items():
+        for _ in range(n):
+            word_counts.subtract(by_key[key].word_counts)
+            alpha_counts.subtract(by_key[key].alpha_counts)
+    for key, n in (new - old).items():
+        for _ in range(n):
+            word_counts.update(by_key[key].word_counts)
+            alpha_counts.update(by_key[key].alpha_counts)
+    # drop types whose count went to zero
+    return +word_counts, +alpha_counts
+
+def _build(text: str, key: str, base: TextAnalysis | None) -> TextAnalysis:
+    paragraphs = [(start, _paragraph(text[start:end])) for start, end in paragraph_bounds(text)]
+
+    if base is not None:
+        word_counts, alpha_counts = _apply_delta(base, paragraphs)
+    else:
+        word_counts, alpha_counts = Counter(), Counter()
+        for _, p in paragraphs:
+            word_counts.update(p.word_counts)
+            alpha_counts.update(p.alpha_counts)
+
+    return TextAnalysis(
+        key=key,
+        text=text,
+        paragraphs=tuple(paragraphs),
+        word_counts=word_counts,
+        alpha_counts=alpha_counts,
+    )
+
+def analyze(text: str, base: TextAnalysis | None = None) -> TextAnalysis:
+    """
+    Cached analysis of text.
+    Pass the previous analysis of the same text box as base to re-use its
+    counts: only edited paragraphs are tokenized and applied as deltas.
+    """
+    key = text_key(text)
+    hit = _cache.get(key)
+    if hit is not None:
+        return hit
+
+    result = _build(text, key, base)
+    _cache.put(key, result)
+    return result
+
+def clear_cache() -> None:
+    _cache.clear()
+    _paragraph_cache.clear()
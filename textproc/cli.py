@@ -0,0 +1,184 @@
+"""
+Command-line batch runs (no Streamlit session needed).
+
+    python -m textproc essays/ -o results/
+    python -m textproc "week*/**/*.txt" submissions.zip -o results/ --format parquet --workers 8
+    python -m textproc answers.csv --text-column answer --id-column student -o results/
+
+Inputs are .txt files, .zip archives of .txt files, directories (searched
+recursively for both) and glob patterns; CSV/XLSX files need --text-column.
+Every document is analysed once in a worker process. Written to the output
+directory, one file per table:
+- diversity:   per document, words/sentences and the TTR family, MATTR, MTLD, HD-D
+- readability: per document, every readability formula and the consensus grade
+- frequency:   word frequency over all documents (merged counts)
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import Counter
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .analysis import ALPHA_WORD_RE, WORD_RE, count_sentences
+from .batch import (
+    TABLE_SUFFIXES,
+    default_workers,
+    iter_file_documents,
+    iter_table_documents,
+    map_documents,
+    read_table,
+)
+from .corpus import TEXT_SUFFIXES
+from .diversity import diversity_summary
+from .export import export_table, parquet_available
+from .frequency import FrequencyTable, encode_tokens
+from .readability import all_scores, consensus_grade, features_from_counts
+
+
+# --format value -> export FORMATS name
+OUTPUT_FORMATS = {
+    "csv": "CSV",
+    "csv.gz": "CSV (gzip)",
+    "xlsx": "Excel (.xlsx)",
+    "parquet": "Parquet",
+}
+FILE_SUFFIXES = TEXT_SUFFIXES + (".zip",)
+
+
+# ----------------------------
+# Inputs
+# ----------------------------
+def find_files(patterns: list[str], tables: bool = False) -> list[str]:
+    """Files named by paths, directories (recursive) or glob patterns; sorted, no duplicates."""
+    suffixes = FILE_SUFFIXES + (TABLE_SUFFIXES if tables else ())
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                found.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith(suffixes))
+        elif os.path.isfile(pattern):
+            found.append(pattern)
+        else:
+            found.extend(p for p in sorted(glob.glob(pattern, recursive=True))
+                         if os.path.isfile(p) and p.lower().endswith(suffixes))
+    return list(dict.fromkeys(found))
+
+def iter_documents(paths: list[str], text_col: str | None = None, id_col: str | None = None) -> Iterator[tuple[str, str]]:
+    """(doc_id, text) for every document in the files; doc_id is the path (plus the member name for .zip)."""
+    for path in paths:
+        lower = path.lower()
+        with open(path, "rb") as raw:
+            if lower.endswith(TABLE_SUFFIXES):
+                if not text_col:
+                    raise ValueError(f"{path}: tables need --text-column")
+                df = read_table(path, raw)
+                for doc_id, text in iter_table_documents(df, text_col, id_col):
+                    yield f"{path}:{doc_id}", text
+            elif lower.endswith(".zip"):
+                for name, text in iter_file_documents(path, raw):
+                    yield f"{path}/{name}", text
+            else:
+                for _, text in iter_file_documents(path, raw):
+                    yield path, text
+
+
+# ----------------------------
+# Per-document work (top-level: runs in worker processes)
+# ----------------------------
+def analyse_document(item: tuple[str, str]) -> tuple[dict, dict, Counter]:
+    """(diversity row, readability row, word counts) for one document, from one tokenization."""
+    doc_id, text = item
+    lowered = text.lower()
+    words = WORD_RE.findall(lowered)
+    codes, vocab = encode_tokens(ALPHA_WORD_RE.findall(lowered))
+    counts = np.bincount(codes, minlength=vocab.size)
+    sentences = count_sentences(text)
+
+    diversity = {"document": doc_id, "words": len(words), "sentences": sentences}
+    diversity.update(diversity_summary(counts, codes))
+
+    features = features_from_counts(Counter(dict(zip(vocab.tolist(), counts.tolist()))), sentences)
+    scores = all_scores(features)
+    readability = {"document": doc_id, **scores}
+    grade = consensus_grade(scores)
+    readability["Consensus grade"] = grade if grade is not None else float("nan")
+    return diversity, readability, Counter(words)
+
+
+def run(documents: list[tuple[str, str]], workers: int) -> tuple[dict, dict]:
+    """All three tables for the documents. Returns (tables, stats)."""
+    start = time.perf_counter()
+    results = map_documents(analyse_document, documents, workers)
+    word_counts = Counter()
+    for _, _, counts in results:
+        word_counts.update(counts)
+    tables = {
+        "diversity": pd.DataFrame([r[0] for r in results]),
+        "readability": pd.DataFrame([r[1] for r in results]),
+        "frequency": FrequencyTable.from_counts(word_counts).sorted().to_columns(),
+    }
+    seconds = time.perf_counter() - start
+    stats = {
+        "documents": len(documents),
+        "seconds": seconds,
+        "docs_per_sec": (len(documents) / seconds) if seconds > 0 else float("inf"),
+        "workers": workers,
+    }
+    return tables, stats
+
+
+# ----------------------------
+# Entry point
+# ----------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m textproc",
+        description="Frequency, diversity and readability tables for a set of texts.",
+    )
+    parser.add_argument("inputs", nargs="+", help="files, directories or glob patterns (quote globs)")
+    parser.add_argument("-o", "--output", default="textproc_output", help="output directory (created if missing)")
+    parser.add_argument("-f", "--format", choices=list(OUTPUT_FORMATS), default="csv", help="table format")
+    parser.add_argument("-w", "--workers", type=int, default=default_workers(),
+                        help="worker processes (default: CPU count; 1 = no pool)")
+    parser.add_argument("--text-column", help="text column of CSV/XLSX inputs")
+    parser.add_argument("--id-column", help="document ID column of CSV/XLSX inputs (default: row number)")
+    return parser
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.format == "parquet" and not parquet_available():
+        parser.error("--format parquet needs pyarrow (pip install pyarrow)")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    paths = find_files(args.inputs, tables=bool(args.text_column))
+    if not paths:
+        parser.error("no .txt/.zip files matched the inputs")
+    try:
+        documents = list(iter_documents(paths, args.text_column, args.id_column))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    tables, stats = run(documents, args.workers)
+
+    fmt = OUTPUT_FORMATS[args.format]
+    os.makedirs(args.output, exist_ok=True)
+    for name, table in tables.items():
+        data, ext, _ = export_table(table, fmt, sheet_name=name)
+        with open(os.path.join(args.output, f"{name}.{ext}"), "wb") as out:
+            out.write(data)
+
+    print(
+        f"{stats['documents']:,} document(s) from {len(paths):,} file(s) in {stats['seconds']:.2f} s "
+        f"({stats['docs_per_sec']:,.1f} docs/s, {stats['workers']} worker(s)) -> {args.output}/",
+        file=sys.stderr,
+    )
+    return 0
@@ -0,0 +1,207 @@
+"""
+KWIC concordancer backed by a suffix array over token IDs.
+
+The token codes analyze() already keeps are reused, and a suffix array over
+the token sequence is built with NumPy prefix doubling (only when a query is
+run, and only up to MAX_INDEX_TOKENS tokens). A word or phrase query is
+then a binary search for the block of suffixes that start with the query
+tokens: O(m log N) per query instead of a regex scan of the whole text.
+"""
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .analysis import WORD_RE, LRUCache, TextAnalysis
+
+
+MAX_INDEX_TOKENS = 2_000_000   # suffix array build: about 1.5 s per million tokens
+
+
+class TokenSpans:
+    """
+    Character offsets of a text's WORD_RE tokens, found one paragraph at a
+    time on first use: KWIC lines only re-scan the paragraphs they come from.
+    """
+
+    def __init__(self, text: str, paragraphs: tuple):
+        # paragraphs: TextAnalysis.paragraphs, (offset, Paragraph) pairs
+        self.text = text
+        self._starts = [offset for offset, _ in paragraphs]
+        self._ends = self._starts[1:] + [len(text)]
+        self._first = np.cumsum([0] + [len(p.words) for _, p in paragraphs])
+        self._found: dict[int, list] = {}
+
+    def __getitem__(self, i: int) -> tuple[int, int]:
+        k = int(np.searchsorted(self._first, i, side="right")) - 1
+        spans = self._found.get(k)
+        if spans is None:
+            spans = [m.span() for m in WORD_RE.finditer(self.text, self._starts[k], self._ends[k])]
+            self._found[k] = spans
+        return spans[min(i - int(self._first[k]), len(spans) - 1)]
+
+
+@dataclass(frozen=True)
+class ConcordanceIndex:
+    codes: np.ndarray          # token IDs in text order
+    vocab: np.ndarray          # ID -> word
+    word_ids: dict             # word -> ID
+    suffixes: np.ndarray       # suffix array: token positions sorted by suffix
+    alpha_rank: np.ndarray     # ID -> alphabetical rank of the word (for sorting lines)
+    spans: TokenSpans | None   # token -> character offsets, when the text is kept
+    text: str | None
+
+    def __len__(self) -> int:
+        return int(self.codes.size)
+
+    # ---- lookup ----
+    def _compare(self, pos: int, query: list) -> int:
+        """-1 / 0 / 1: suffix at pos vs query, on the first len(query) tokens."""
+        seg = self.codes[pos:pos + len(query)].tolist()
+        if seg == query:
+            return 0
+        return -1 if seg < query else 1
+
+    def find(self, phrase: str) -> np.ndarray:
+        """Token positions where the phrase starts (sorted by position)."""
+        words = WORD_RE.findall(phrase.lower())
+        if not words or any(w not in self.word_ids for w in words):
+            return np.array([], dtype=np.int64)
+        query = [self.word_ids[w] for w in words]
+
+        lo, hi = 0, self.suffixes.size
+        while lo < hi:  # first suffix >= query
+            mid = (lo + hi) // 2
+            if self._compare(int(self.suffixes[mid]), query) < 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        start = lo
+        hi = self.suffixes.size
+        while lo < hi:  # first suffix > query
+            mid = (lo + hi) // 2
+            if self._compare(int(self.suffixes[mid]), query) <= 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        return np.sort(self.suffixes[start:lo])
+
+    # ---- KWIC lines ----
+    def _context_key(self, positions: np.ndarray, offsets: range) -> list:
+        n = self.codes.size
+        keys = []
+        for off in offsets:
+            idx = positions + off
+            valid = (idx >= 0) & (idx < n)
+            rank = np.where(valid, self.alpha_rank[self.codes[np.clip(idx, 0, n - 1)]], -1)
+            keys.append(rank)
+        return keys
+
+    def kwic(
+        self,
+        phrase: str,
+        width: int = 8,
+        sort_by: str = "position",
+        limit: int | None = 500,
+    ) -> pd.DataFrame:
+        """
+        Keyword-in-context lines.
+        - width: context tokens on each side
+        - sort_by: "position", "left" (L1, L2, L3 words A→Z) or "right" (R1, R2, R3)
+        """
+        hits = self.find(phrase)
+        m = len(WORD_RE.findall(phrase.lower()))
+        if hits.size and sort_by in ("left", "right"):
+            offsets = range(-1, -4, -1) if sort_by == "left" else range(m, m + 3)
+            keys = self._context_key(hits, offsets)
+            hits = hits[np.lexsort(tuple(reversed(keys)))]
+        if limit:
+            hits = hits[:limit]
+
+        rows = [self._line(int(p), m, width) for p in hits]
+        return pd.DataFrame(rows, columns=["position", "left", "keyword", "right"])
+
+    def _line(self, pos: int, m: int, width: int) -> tuple:
+        n = self.codes.size
+        a, b = max(0, pos - width), min(n, pos + m + width)
+        if self.text is not None:
+            s = self.spans
+            left = self.text[s[a][0]:s[pos][0]] if pos > a else ""
+            key = self.text[s[pos][0]:s[pos + m - 1][1]]
+            right = self.text[s[pos + m - 1][1]:s[b - 1][1]] if b > pos + m else ""
+            return pos, " ".join(left.split()), key, " ".join(right.split())
+        words = self.vocab[self.codes[a:b]].tolist()
+        k0, k1 = pos - a, pos - a + m
+        return pos, " ".join(words[:k0]), " ".join(words[k0:k1]), " ".join(words[k1:])
+
+
+def suffix_array(codes: np.ndarray) -> np.ndarray:
+    """
+    Suffix array of an integer sequence by prefix doubling.
+    Each round sorts by (rank[i], rank[i + k]) with np.lexsort; stops as soon
+    as all ranks are distinct, so typical texts need only a few rounds.
+    """
+    n = codes.size
+    if n == 0:
+        return np.array([], dtype=np.int64)
+    rank = np.unique(codes, return_inverse=True)[1].astype(np.int64)
+    sa = np.argsort(rank, kind="stable")
+    k = 1
+    while k < n:
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - k] = rank[k:]
+        sa = np.lexsort((second, rank))
+        r, s2 = rank[sa], second[sa]
+        new_group = np.ones(n, dtype=np.int64)
+        new_group[1:] = (r[1:] != r[:-1]) | (s2[1:] != s2[:-1])
+        new_rank = np.empty(n, dtype=np.int64)
+        new_rank[sa] = np.cumsum(new_group) - 1
+        rank = new_rank
+        if rank[sa[-1]] == n - 1:
+            break
+        k *= 2
+    return sa.astype(np.int64)
+
+def index_from_codes(codes: np.ndarray, vocab: np.ndarray, spans: TokenSpans | None = None) -> ConcordanceIndex:
+    """Index already-encoded tokens (TextAnalysis / WorkspaceSubset .word_codes); no re-tokenizing."""
+    vocab = np.asarray(vocab, dtype=str) if len(vocab) else np.array([], dtype="U1")
+    alpha_rank = np.empty(len(vocab), dtype=np.int64)
+    alpha_rank[np.argsort(vocab, kind="stable")] = np.arange(len(vocab))
+    return ConcordanceIndex(
+        codes=codes,
+        vocab=vocab,
+        word_ids={w: i for i, w in enumerate(vocab.tolist())},
+        suffixes=suffix_array(codes),
+        alpha_rank=alpha_rank,
+        spans=spans,
+        text=spans.text if spans is not None else None,
+    )
+
+def build_index_from_chunks(chunks: Iterable[str]) -> ConcordanceIndex:
+    """Index a streamed corpus; only token IDs are kept (lines show tokens)."""
+    word_ids: dict[str, int] = {}
+    parts = []
+    for chunk in chunks:
+        parts.append(np.fromiter(
+            (word_ids.setdefault(w, len(word_ids)) for w in WORD_RE.findall(chunk.lower())),
+            dtype=np.int64,
+        ))
+    codes = np.concatenate(parts) if parts else np.array([], dtype=np.int64)
+    return index_from_codes(codes, np.array(list(word_ids), dtype=str))
+
+
+INDEX_CACHE_SIZE = 16
+_index_cache = LRUCache(INDEX_CACHE_SIZE)
+
+def concordance_index(analysis: TextAnalysis) -> ConcordanceIndex:
+    """
+    Index of a pasted text from the word codes analyze() keeps (cached by
+    content hash, shared across sessions); lines show the original text.
+    """
+    index = _index_cache.get(analysis.key)
+    if index is None:
+        codes, vocab = analysis.word_codes
+        index = index_from_codes(codes, vocab, TokenSpans(analysis.text, analysis.paragraphs))
+        _index_cache.put(analysis.key, index)
+    return index
@@ -0,0 +1,155 @@
+"""
+Streaming corpus reader for uploads that do not fit in a text box.
+
+Files are read in fixed-size chunks through generators and only the per-chunk
+counts are kept, so memory grows with the vocabulary (Counter keys), not with
+the size of the corpus. With top_k set, word counts go into fixed-size
+Space-Saving summaries instead (approximate, constant memory).
+"""
+import io
+import zipfile
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import BinaryIO, Iterator
+
+from .analysis import ALPHA_WORD_RE, WORD_RE, count_sentences
+from .frequency import FrequencyTable
+from .readability import ReadabilityFeatures, features_from_counts, syllable_count
+from .sketch import SpaceSaving
+
+
+CHUNK_CHARS = 1 << 20  # ~1M characters per chunk
+TEXT_SUFFIXES = (".txt",)
+
+
+def iter_text_chunks(raw: BinaryIO, chunk_chars: int = CHUNK_CHARS) -> Iterator[str]:
+    """
+    Decode a binary stream and yield text chunks that never split a word.
+    - the tail after the last whitespace is carried into the next chunk
+    - utf-8 with BOM stripped; undecodable bytes are replaced
+    """
+    reader = io.TextIOWrapper(raw, encoding="utf-8-sig", errors="replace", newline="")
+    carry = ""
+    while True:
+        block = reader.read(chunk_chars)
+        if not block:
+            break
+        block = carry + block
+        cut = max(block.rfind(" "), block.rfind("\n"), block.rfind("\t"))
+        if cut <= 0:
+            carry = block  # one giant token: keep reading until whitespace shows up
+            continue
+        carry = block[cut:]
+        yield block[:cut]
+    reader.detach()
+    if carry:
+        yield carry
+
+def iter_corpus_streams(name: str, raw: BinaryIO) -> Iterator[tuple[str, BinaryIO]]:
+    """Yield (document name, binary stream) for a .txt file or every .txt inside a .zip."""
+    if name.lower().endswith(".zip"):
+        with zipfile.ZipFile(raw) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(TEXT_SUFFIXES):
+                    continue
+                if info.filename.startswith("__MACOSX/"):
+                    continue
+                with zf.open(info) as member:
+                    yield info.filename, member
+    else:
+        yield name, raw
+
+def iter_corpus_chunks(name: str, raw: BinaryIO, chunk_chars: int = CHUNK_CHARS) -> Iterator[str]:
+    for _, stream in iter_corpus_streams(name, raw):
+        yield from iter_text_chunks(stream, chunk_chars)
+
+def iter_document_counts(name: str, raw: BinaryIO, chunk_chars: int = CHUNK_CHARS) -> Iterator[Counter]:
+    """Word counts per document of a .txt/.zip upload (one Counter per file, e.g. for dispersion)."""
+    for _, stream in iter_corpus_streams(name, raw):
+        counts = Counter()
+        for chunk in iter_text_chunks(stream, chunk_chars):
+            counts.update(WORD_RE.findall(chunk.lower()))
+        yield counts
+
+
+@dataclass
+class CorpusStats:
+    """
+    Merged counts for a streamed corpus.
+    Exposes the same fields the tabs read from TextAnalysis.
+
+    top_k: keep only that many word types per table (Space-Saving summaries,
+    approximate counts). word_counts/alpha_counts then stay empty and the
+    readability features are summed per chunk instead.
+    """
+    word_counts: Counter = field(default_factory=Counter)
+    alpha_counts: Counter = field(default_factory=Counter)
+    word_count: int = 0
+    alpha_token_count: int = 0
+    sentence_count: int = 0
+    char_count: int = 0
+    documents: int = 0
+    top_k: int | None = None
+    word_sketch: SpaceSaving | None = None
+    alpha_sketch: SpaceSaving | None = None
+    features: ReadabilityFeatures | None = None
+
+    def __post_init__(self):
+        if self.top_k:
+            self.word_sketch = SpaceSaving(self.top_k)
+            self.alpha_sketch = SpaceSaving(self.top_k)
+            self.features = ReadabilityFeatures()
+
+    @property
+    def approximate(self) -> bool:
+        return self.word_sketch is not None
+
+    @cached_property
+    def syllables(self) -> dict:
+        return {w: syllable_count(w) for w in self.alpha_counts}
+
+    @cached_property
+    def word_table(self) -> FrequencyTable:
+        if self.approximate:
+            return self.word_sketch.table()
+        return FrequencyTable.from_counts(self.word_counts)
+
+    @cached_property
+    def alpha_table(self) -> FrequencyTable:
+        if self.approximate:
+            return self.alpha_sketch.table()
+        return FrequencyTable.from_counts(self.alpha_counts)
+
+    def add_chunk(self, chunk: str) -> None:
+        lowered = chunk.lower()
+        words = WORD_RE.findall(lowered)
+        alpha = ALPHA_WORD_RE.findall(lowered)
+        sentences = count_sentences(chunk)
+        if self.approximate:
+            alpha_counts = Counter(alpha)
+            self.word_sketch.update(Counter(words))
+            self.alpha_sketch.update(alpha_counts)
+            self.features += features_from_counts(alpha_counts, sentences)
+        else:
+            self.word_counts.update(words)
+            self.alpha_counts.update(alpha)
+        self.word_count += len(words)
+        self.alpha_token_count += len(alpha)
+        self.sentence_count += sentences
+        self.char_count += len(chunk)
+
+
+def count_corpus(
+    name: str,
+    raw: BinaryIO,
+    chunk_chars: int = CHUNK_CHARS,
+    top_k: int | None = None,
+) -> CorpusStats:
+    """Stream a .txt/.zip upload and return merged counts (top_k: approximate, bounded memory)."""
+    stats = CorpusStats(top_k=top_k)
+    for _, stream in iter_corpus_streams(name, raw):
+        stats.documents += 1
+        for chunk in iter_text_chunks(stream, chunk_chars):
+            stats.add_chunk(chunk)
+    return stats
@@ -0,0 +1,133 @@
+"""
+Dispersion: how evenly each word type is spread over the parts of a corpus.
+
+Counts are gathered in a scipy.sparse word × part matrix (CSR, one stored
+entry per word type present in a part), so zero cells are never
+materialised. For every word type at once:
+- range: number of parts the word occurs in
+- Juilland's D: 1 - CV / sqrt(P - 1), on per-part relative frequencies
+  (1 = perfectly even, 0 = all in one part)
+- Gries' DP: half the summed |observed share - expected share| over parts,
+  expected share = part size / corpus size (0 = even, → 1 = clustered)
+"""
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+from scipy import sparse
+
+
+DEFAULT_PARTS = 10
+METRICS = ("range", "juilland_d", "dp")
+
+
+@dataclass(frozen=True)
+class Dispersion:
+    words: np.ndarray        # sorted A→Z
+    range: np.ndarray        # parts containing the word
+    juilland_d: np.ndarray
+    dp: np.ndarray
+    n_parts: int
+
+    def lookup(self, words) -> dict:
+        """Metric arrays aligned with `words` (NaN / 0 for words not seen)."""
+        words = np.asarray(words, dtype=str)
+        if not self.words.size:
+            nan = np.full(words.size, np.nan)
+            return {"range": np.zeros(words.size, dtype=np.int64), "juilland_d": nan, "dp": nan}
+        pos = np.clip(np.searchsorted(self.words, words), 0, self.words.size - 1)
+        found = self.words[pos] == words
+        return {
+            "range": np.where(found, self.range[pos], 0),
+            "juilland_d": np.where(found, self.juilland_d[pos], np.nan),
+            "dp": np.where(found, self.dp[pos], np.nan),
+        }
+
+
+def _row_sums(matrix: sparse.csr_matrix, data: np.ndarray) -> np.ndarray:
+    """Per-row sums of other values on the matrix's stored entries."""
+    same_pattern = sparse.csr_matrix((data, matrix.indices, matrix.indptr), shape=matrix.shape)
+    return np.asarray(same_pattern.sum(axis=1)).ravel()
+
+def _from_matrix(vocab: np.ndarray, matrix: sparse.csr_matrix, part_sizes: np.ndarray) -> Dispersion:
+    """Core: word × part count matrix (every row non-empty) + tokens per part."""
+    n_words, n_parts = matrix.shape
+    counts = matrix.data.astype(np.float64)
+    parts = matrix.indices
+    rows = np.repeat(np.arange(n_words), np.diff(matrix.indptr))
+    sizes = part_sizes.astype(np.float64)
+    total = sizes.sum()
+
+    freq = np.asarray(matrix.sum(axis=1), dtype=np.float64).ravel()
+    rng = matrix.getnnz(axis=1)
+
+    # Juilland's D on relative frequencies (handles unequal parts)
+    rel = counts / np.maximum(sizes[parts], 1)
+    mean = _row_sums(matrix, rel) / n_parts
+    sd = np.sqrt(np.maximum(_row_sums(matrix, rel * rel) / n_parts - mean * mean, 0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d = 1 - (sd / mean) / np.sqrt(n_parts - 1) if n_parts > 1 else np.full(n_words, np.nan)
+
+    # Gries' DP: parts without the word contribute their expected share
+    expected = sizes / total if total else np.zeros(n_parts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        observed = counts / freq[rows]
+    diff = _row_sums(matrix, np.abs(observed - expected[parts]))
+    covered = _row_sums(matrix, expected[parts])
+    dp = 0.5 * (diff + (1 - covered))
+
+    order = np.argsort(vocab, kind="stable")
+    return Dispersion(
+        words=vocab[order],
+        range=rng[order].astype(np.int64),
+        juilland_d=np.clip(np.asarray(d), 0, 1)[order],   # clip float noise
+        dp=dp[order],
+        n_parts=n_parts,
+    )
+
+def from_parts(codes: np.ndarray, vocab: np.ndarray, part_of_token: np.ndarray, n_parts: int) -> Dispersion:
+    """Integer-encoded tokens with a part index per token."""
+    codes = np.asarray(codes, dtype=np.int64)
+    part_of_token = np.asarray(part_of_token, dtype=np.int64)
+    vocab = np.asarray(vocab)
+    # duplicate (word, part) pairs are summed by the COO -> CSR conversion
+    matrix = sparse.coo_matrix(
+        (np.ones(codes.size, dtype=np.int64), (codes, part_of_token)), shape=(vocab.size, n_parts),
+    ).tocsr()
+    sizes = np.bincount(part_of_token, minlength=n_parts)
+
+    # keep only types that occur (vocab may be larger than the tokens used)
+    used = np.flatnonzero(matrix.getnnz(axis=1))
+    return _from_matrix(vocab[used], matrix[used], sizes)
+
+def from_codes(codes: np.ndarray, vocab: np.ndarray, n_parts: int = DEFAULT_PARTS) -> Dispersion:
+    """N equal consecutive parts of the token sequence."""
+    codes = np.asarray(codes)
+    n_parts = max(1, min(int(n_parts), codes.size or 1))
+    part_of_token = np.arange(codes.size) * n_parts // max(codes.size, 1)
+    return from_parts(codes, vocab, part_of_token, n_parts)
+
+def from_lengths(codes: np.ndarray, vocab: np.ndarray, lengths: Iterable[int]) -> Dispersion:
+    """Parts given by consecutive lengths (e.g. tokens per document)."""
+    lengths = np.asarray(list(lengths), dtype=np.int64)
+    part_of_token = np.repeat(np.arange(lengths.size), lengths)
+    return from_parts(codes, vocab, part_of_token, max(1, lengths.size))
+
+def from_documents(doc_counts: Iterable[Counter]) -> Dispersion:
+    """One Counter of word counts per document (e.g. streamed from an upload)."""
+    words, word_parts, values, sizes = [], [], [], []
+    for part, counts in enumerate(doc_counts):
+        words.extend(counts.keys())
+        values.extend(counts.values())
+        word_parts.extend([part] * len(counts))
+        sizes.append(sum(counts.values()))
+    if not words:
+        return _from_matrix(np.array([], dtype="U1"), sparse.csr_matrix((0, 1), dtype=np.int64),
+                            np.array([0], dtype=np.int64))
+    vocab, word_idx = np.unique(np.array(words, dtype=str), return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.asarray(values, dtype=np.int64), (word_idx, np.asarray(word_parts, dtype=np.int64))),
+        shape=(vocab.size, len(sizes)),
+    )
+    return _from_matrix(vocab, matrix, np.asarray(sizes, dtype=np.int64))
@@ -0,0 +1,136 @@
+"""
+Lexical diversity indices.
+
+- TTR family from token (N) and type (V) counts
+- MATTR / MTLD from the integer-encoded token sequence (O(N))
+- HD-D from type counts
+"""
+import math
+
+import numpy as np
+
+
+def ttr_family(n_tokens: int, n_types: int) -> dict:
+    """
+    TTR and its classic length corrections.
+    - TTR = V/N, Root TTR (Guiraud) = V/√N, CTTR = V/√(2N), Log TTR = log V / log N
+    - Log TTR is NaN when V or N is 1 (log 1 = 0)
+    """
+    N, V = n_tokens, n_types
+    if N == 0:
+        nan = float("nan")
+        return {"ttr": nan, "root_ttr": nan, "cttr": nan, "log_ttr": nan}
+    return {
+        "ttr": V / N,
+        "root_ttr": V / math.sqrt(N),
+        "cttr": V / math.sqrt(2 * N),
+        "log_ttr": (math.log(V) / math.log(N)) if (V > 1 and N > 1) else float("nan"),
+    }
+
+
+# ----------------------------
+# Length-robust indices (token order matters for MATTR/MTLD)
+# ----------------------------
+def _prev_next(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Previous/next position of the same type for every token (-1 / N if none).
+    One stable argsort groups equal codes with positions in order.
+    """
+    n = codes.size
+    order = np.argsort(codes, kind="stable")
+    same = codes[order[1:]] == codes[order[:-1]]
+    prev = np.full(n, -1, dtype=np.int64)
+    nxt = np.full(n, n, dtype=np.int64)
+    prev[order[1:][same]] = order[:-1][same]
+    nxt[order[:-1][same]] = order[1:][same]
+    return prev, nxt
+
+def mattr(codes: np.ndarray, window: int = 50) -> float:
+    """
+    Moving-average TTR (Covington & McFall 2010) over integer-encoded tokens.
+    Types per window are updated as the window slides one token at a time:
+    - the leaving token drops a type if its next occurrence is past the new window
+    - the entering token adds a type if its previous occurrence is before the window
+    Falls back to plain TTR when the text is shorter than the window.
+    """
+    codes = np.asarray(codes)
+    n = codes.size
+    if n == 0:
+        return float("nan")
+    if n <= window:
+        return np.unique(codes).size / n
+
+    prev, nxt = _prev_next(codes)
+    first = int(np.count_nonzero(prev[:window] < 0))
+    s = np.arange(1, n - window + 1)
+    leave = nxt[s - 1] > s + window - 2
+    enter = prev[s + window - 1] < s
+    types = first + np.cumsum(enter.astype(np.int64) - leave.astype(np.int64))
+    return float((first + types.sum()) / (window * (types.size + 1)))
+
+def _mtld_pass(codes: list, threshold: float) -> float:
+    factors = 0.0
+    seen = set()
+    tokens = 0
+    for c in codes:
+        tokens += 1
+        seen.add(c)
+        if len(seen) / tokens <= threshold:
+            factors += 1
+            seen = set()
+            tokens = 0
+    if tokens:
+        factors += (1 - len(seen) / tokens) / (1 - threshold)
+    return (len(codes) / factors) if factors > 0 else float("nan")
+
+def mtld(codes: np.ndarray, threshold: float = 0.72) -> float:
+    """
+    MTLD (McCarthy & Jarvis 2010): mean length of segments that keep TTR above
+    the threshold, averaged over a forward and a backward pass. O(N) per pass.
+    """
+    seq = np.asarray(codes).tolist()
+    if not seq:
+        return float("nan")
+    return (_mtld_pass(seq, threshold) + _mtld_pass(seq[::-1], threshold)) / 2
+
+def hdd(counts: np.ndarray, draws: int = 42) -> float:
+    """
+    HD-D (McCarthy & Jarvis 2007): expected TTR of a random 42-token sample,
+    from the hypergeometric chance that each type appears at least once.
+    Needs counts only, so it also works for streamed corpora.
+    """
+    from scipy.special import gammaln
+
+    counts = np.asarray(counts, dtype=np.float64)
+    n = counts.sum()
+    if n < draws:
+        return float("nan")
+    # P(type absent) = C(N - c, draws) / C(N, draws), in log space
+    with np.errstate(invalid="ignore"):
+        log_p0 = (
+            gammaln(n - counts + 1) - gammaln(n - counts - draws + 1)
+            - gammaln(n + 1) + gammaln(n - draws + 1)
+        )
+    p0 = np.where(n - counts >= draws, np.exp(log_p0), 0.0)
+    return float(np.sum(1.0 - p0) / draws)
+
+def diversity_summary(counts: np.ndarray, codes: np.ndarray | None = None, window: int = 50) -> dict:
+    """
+    All indices in one dict (metric name -> value), e.g. for an export sheet.
+    MATTR/MTLD need the token sequence (codes) and are NaN without it.
+    """
+    counts = np.asarray(counts)
+    n_tokens, n_types = int(counts.sum()), int(counts.size)
+    div = ttr_family(n_tokens, n_types)
+    has_seq = codes is not None and len(codes) > 0
+    return {
+        "Tokens (N)": n_tokens,
+        "Types (V)": n_types,
+        "TTR": div["ttr"],
+        "Root TTR (Guiraud)": div["root_ttr"],
+        "CTTR": div["cttr"],
+        "Log TTR": div["log_ttr"],
+        f"MATTR (window = {window})": mattr(codes, window) if has_seq else float("nan"),
+        "MTLD": mtld(codes) if has_seq else float("nan"),
+        "HD-D": hdd(counts),
+    }
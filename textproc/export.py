@@ -0,0 +1,144 @@
+"""
+Download formats for large tables, written in bounded memory.
+
+Tables are passed as column arrays (or DataFrames) and written in row chunks,
+so no full CSV string or regular openpyxl workbook of the whole table is
+built next to the data:
+- CSV (plain or gzip) through csv.writer straight into the output buffer
+- XLSX through openpyxl's write-only (streaming) workbook, several sheets
+- Parquet through pyarrow, when it is installed
+"""
+import csv
+import gzip
+import hashlib
+import io
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+
+CHUNK_ROWS = 10_000
+EXCEL_MAX_ROWS = 1_048_575   # sheet limit minus the header row
+
+Columns = dict  # column name -> 1-D array (all the same length)
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def as_columns(table) -> Columns:
+    """DataFrame or dict of arrays -> dict of arrays (no copy for arrays)."""
+    if isinstance(table, pd.DataFrame):
+        return {c: table[c].to_numpy() for c in table.columns}
+    return dict(table)
+
+def table_fingerprint(table) -> str:
+    """Content hash of a table (names + values), to tell whether prepared bytes are still current."""
+    columns = as_columns(table)
+    h = hashlib.blake2b(repr(list(columns)).encode("utf-8"), digest_size=16)
+    if columns:
+        h.update(pd.util.hash_pandas_object(pd.DataFrame(columns), index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+def iter_row_chunks(columns: Columns, chunk_rows: int = CHUNK_ROWS) -> Iterator[list]:
+    """Rows as lists of Python values, chunk_rows at a time."""
+    arrays = list(columns.values())
+    n = len(arrays[0]) if arrays else 0
+    for start in range(0, n, chunk_rows):
+        parts = [np.asarray(a[start:start + chunk_rows]).tolist() for a in arrays]
+        yield list(zip(*parts))
+
+
+# ----------------------------
+# CSV
+# ----------------------------
+def _write_csv(columns: Columns, text_stream) -> None:
+    writer = csv.writer(text_stream)
+    writer.writerow(list(columns))
+    for rows in iter_row_chunks(columns):
+        writer.writerows(rows)
+
+def csv_bytes(table, compress: bool = False) -> bytes:
+    """UTF-8 (with BOM, for Excel) CSV; gzip-compressed when compress=True."""
+    columns = as_columns(table)
+    out = io.BytesIO()
+    raw = gzip.GzipFile(fileobj=out, mode="wb", mtime=0) if compress else out
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    _write_csv(columns, text)
+    text.flush()
+    text.detach()
+    if compress:
+        raw.close()
+    return out.getvalue()
+
+
+# ----------------------------
+# XLSX (write-only workbook)
+# ----------------------------
+def xlsx_bytes(sheets: dict) -> bytes:
+    """
+    One workbook, one sheet per entry (sheet name -> table).
+    Uses openpyxl write_only mode: rows go straight to the zip stream.
+    Sheets longer than Excel's row limit are truncated.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for name, table in sheets.items():
+        columns = as_columns(table)
+        ws = wb.create_sheet(title=str(name)[:31])
+        ws.append(list(columns))
+        written = 0
+        for rows in iter_row_chunks(columns):
+            for row in rows[:EXCEL_MAX_ROWS - written]:
+                ws.append(row)
+            written += len(rows)
+            if written >= EXCEL_MAX_ROWS:
+                break
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+# ----------------------------
+# Parquet
+# ----------------------------
+def parquet_bytes(table) -> bytes:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = as_columns(table)
+    out = io.BytesIO()
+    pq.write_table(pa.table({k: np.asarray(v) for k, v in columns.items()}), out, compression="zstd")
+    return out.getvalue()
+
+
+# ----------------------------
+# One entry point for download buttons
+# ----------------------------
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Excel (.xlsx)": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": ("parquet", "application/octet-stream"),
+}
+
+def available_formats() -> list[str]:
+    return [f for f in FORMATS if f != "Parquet" or parquet_available()]
+
+def export_table(table, fmt: str, sheet_name: str = "data") -> tuple[bytes, str, str]:
+    """(data, file extension, mime) for one table in one of FORMATS."""
+    ext, mime = FORMATS[fmt]
+    if fmt == "CSV":
+        data = csv_bytes(table)
+    elif fmt == "CSV (gzip)":
+        data = csv_bytes(table, compress=True)
+    elif fmt == "Excel (.xlsx)":
+        data = xlsx_bytes({sheet_name: table})
+    else:
+        data = parquet_bytes(table)
+    return data, ext, mime
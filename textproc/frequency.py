@@ -0,0 +1,166 @@
+"""
+Frequency-table backend.
+
+Counts come straight from the tokenizer output (hash counting with Counter, or
+np.unique over integer-encoded tokens) and stay as NumPy arrays; filtering and
+the three table sort orders are array operations. A DataFrame is only built at
+display time via to_frame().
+"""
+from collections import Counter
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+
+SORT_FREQUENCY = "frequency"
+SORT_ALPHA = "alpha"
+SORT_LENGTH = "length"
+
+
+def encode_tokens(tokens: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Integer-encode tokens: (codes, vocab) with vocab[codes] == tokens.
+    Vocabulary is in first-seen order; a dict lookup per token, no sorting.
+    """
+    index: dict[str, int] = {}
+    codes = np.fromiter((index.setdefault(t, len(index)) for t in tokens), dtype=np.int32)
+    vocab = np.array(list(index), dtype=str) if index else np.array([], dtype="U1")
+    return codes, vocab
+
+
+@dataclass(frozen=True)
+class FrequencyTable:
+    words: np.ndarray    # unicode array of word types
+    counts: np.ndarray   # int64, same order as words
+
+    # ---- construction ----
+    @classmethod
+    def from_counts(cls, counts: dict) -> "FrequencyTable":
+        if not counts:
+            return cls(np.array([], dtype="U1"), np.array([], dtype=np.int64))
+        words = np.array(list(counts.keys()))
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        return cls(words, values)
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[str]) -> "FrequencyTable":
+        return cls.from_counts(Counter(tokens))
+
+    @classmethod
+    def from_codes(cls, codes: np.ndarray, vocab: np.ndarray) -> "FrequencyTable":
+        """Integer-encoded tokens (codes index into vocab) -> table via np.bincount."""
+        if codes.size == 0:
+            return cls.from_counts({})
+        counts = np.bincount(codes, minlength=len(vocab)).astype(np.int64)
+        keep = counts > 0
+        return cls(np.asarray(vocab)[keep], counts[keep])
+
+    # ---- basic properties ----
+    def __len__(self) -> int:
+        return int(self.words.size)
+
+    @property
+    def n_tokens(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.char.str_len(self.words) if self.words.size else np.array([], dtype=np.int64)
+
+    # ---- filtering ----
+    def _take(self, idx) -> "FrequencyTable":
+        return FrequencyTable(self.words[idx], self.counts[idx])
+
+    def without(self, stop_words: set[str]) -> "FrequencyTable":
+        if not stop_words or not len(self):
+            return self
+        mask = ~np.isin(self.words, np.array(list(stop_words)))
+        return self._take(mask)
+
+    def min_count(self, n: int) -> "FrequencyTable":
+        if n <= 1:
+            return self
+        return self._take(self.counts >= n)
+
+    # ---- sorting ----
+    def _word_rank(self) -> np.ndarray:
+        rank = np.empty(len(self), dtype=np.int64)
+        rank[np.argsort(self.words, kind="stable")] = np.arange(len(self))
+        return rank
+
+    def order(self, by: str = SORT_FREQUENCY, ascending: bool = False) -> np.ndarray:
+        """
+        Row order matching the Word Frequency tab:
+        - frequency: count (asc/desc), then word A→Z
+        - alpha: word (asc/desc), then count high→low
+        - length: length (asc/desc), then count high→low, then word A→Z
+        """
+        if not len(self):
+            return np.array([], dtype=np.int64)
+        rank = self._word_rank()
+        sign = 1 if ascending else -1
+        # np.lexsort: last key is the primary key
+        if by == SORT_ALPHA:
+            return np.lexsort((-self.counts, sign * rank))
+        if by == SORT_LENGTH:
+            return np.lexsort((rank, -self.counts, sign * self.lengths))
+        return np.lexsort((rank, sign * self.counts))
+
+    def sorted(self, by: str = SORT_FREQUENCY, ascending: bool = False) -> "FrequencyTable":
+        return self._take(self.order(by, ascending))
+
+    def sorted_by(self, values: np.ndarray, ascending: bool = False) -> "FrequencyTable":
+        """Sort by an external per-word column (e.g. dispersion), then count high→low, then word A→Z; NaN last."""
+        if not len(self):
+            return self
+        values = np.asarray(values, dtype=np.float64)
+        key = np.where(np.isnan(values), np.inf, values if ascending else -values)
+        return self._take(np.lexsort((self._word_rank(), -self.counts, key)))
+
+    def head(self, n: int | None) -> "FrequencyTable":
+        if not n:
+            return self
+        return self._take(slice(0, int(n)))
+
+    def most_common(self, n: int) -> "FrequencyTable":
+        """Top-n by frequency without sorting the whole table (partition first)."""
+        if n <= 0:
+            return self._take(slice(0, 0))
+        if n >= len(self):
+            return self.sorted()
+        # keep everything at or above the n-th largest count, so ties at the
+        # cut-off are still resolved alphabetically like the full sort
+        threshold = -np.partition(-self.counts, n - 1)[n - 1]
+        return self._take(self.counts >= threshold).sorted().head(n)
+
+    # ---- lookup (for paged views) ----
+    @cached_property
+    def alpha_index(self) -> tuple[np.ndarray, np.ndarray]:
+        """(row order A→Z, words in that order); built once per table."""
+        idx = np.argsort(self.words, kind="stable")
+        return idx, self.words[idx]
+
+    def prefix_rows(self, prefix: str) -> np.ndarray:
+        """Rows (in table order) whose word starts with prefix: binary search on alpha_index."""
+        if not prefix:
+            return np.arange(len(self))
+        idx, words = self.alpha_index
+        lo = np.searchsorted(words, prefix, side="left")
+        hi = np.searchsorted(words, prefix + "\U0010ffff", side="left")
+        return np.sort(idx[lo:hi])
+
+    # ---- display / export ----
+    def to_columns(self, with_length: bool = True) -> dict:
+        """Column arrays (no DataFrame) for the streaming exporters."""
+        data = {"word": self.words, "count": self.counts}
+        if with_length:
+            data["length"] = self.lengths
+        return data
+
+    def to_frame(self, with_length: bool = True) -> pd.DataFrame:
+        data = self.to_columns(with_length)
+        data["word"] = data["word"].astype(str)
+        return pd.DataFrame(data)
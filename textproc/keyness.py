@@ -0,0 +1,147 @@
+"""
+Keyness: which words are over- or under-used in a target text compared with
+a reference text or corpus.
+
+Both frequency tables are aligned on one shared vocabulary index and every
+statistic is computed for all word types at once as NumPy array operations.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .frequency import FrequencyTable
+
+
+# log-likelihood critical values (1 d.f.)
+LL_CRITICAL = {
+    "p < 0.05": 3.84,
+    "p < 0.01": 6.63,
+    "p < 0.001": 10.83,
+    "p < 0.0001": 15.13,
+    "no threshold": 0.0,
+}
+
+SORT_COLUMNS = ("log-likelihood", "chi-square", "%DIFF", "log ratio", "target", "reference")
+
+
+@dataclass(frozen=True)
+class KeynessTable:
+    words: np.ndarray
+    target: np.ndarray        # frequency in the target
+    reference: np.ndarray     # frequency in the reference
+    target_total: int
+    reference_total: int
+    log_likelihood: np.ndarray   # signed: + = overused in target
+    chi_square: np.ndarray
+    pct_diff: np.ndarray
+    log_ratio: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.words.size)
+
+    def column(self, name: str) -> np.ndarray:
+        return {
+            "log-likelihood": self.log_likelihood,
+            "chi-square": self.chi_square,
+            "%DIFF": self.pct_diff,
+            "log ratio": self.log_ratio,
+            "target": self.target,
+            "reference": self.reference,
+        }[name]
+
+    def select(self, min_ll: float = 0.0, direction: str = "both") -> np.ndarray:
+        """Row indices passing the |LL| threshold; direction: both / positive / negative."""
+        keep = np.abs(self.log_likelihood) >= min_ll
+        if direction == "positive":
+            keep &= self.log_likelihood > 0
+        elif direction == "negative":
+            keep &= self.log_likelihood < 0
+        return np.flatnonzero(keep)
+
+    def to_frame(self, rows: np.ndarray, sort_by: str = "log-likelihood", top: int | None = None) -> pd.DataFrame:
+        """Rows sorted by |sort_by| (high→low), then word A→Z; a DataFrame only for what is shown."""
+        key = np.abs(self.column(sort_by)[rows])
+        rank = np.argsort(self.words[rows], kind="stable")
+        tie = np.empty_like(rank)
+        tie[rank] = np.arange(rank.size)
+        rows = rows[np.lexsort((tie, -key))]
+        if top:
+            rows = rows[:top]
+        return pd.DataFrame({
+            "word": self.words[rows].astype(str),
+            "target": self.target[rows],
+            "reference": self.reference[rows],
+            "log-likelihood": self.log_likelihood[rows].round(2),
+            "chi-square": self.chi_square[rows].round(2),
+            "%DIFF": self.pct_diff[rows].round(1),
+            "log ratio": self.log_ratio[rows].round(2),
+        })
+
+
+def align(a: FrequencyTable, b: FrequencyTable) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Shared vocabulary and the two frequency vectors on it (0 where a word is missing)."""
+    words, inverse = np.unique(np.concatenate([a.words, b.words]), return_inverse=True)
+    fa = np.bincount(inverse[:len(a)], weights=a.counts, minlength=words.size).astype(np.int64)
+    fb = np.bincount(inverse[len(a):], weights=b.counts, minlength=words.size).astype(np.int64)
+    return words, fa, fb
+
+def _xlogx_over_e(o: np.ndarray, e: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(o > 0, o * np.log(o / e), 0.0)
+
+def compare(target: FrequencyTable, reference: FrequencyTable) -> KeynessTable:
+    """
+    Keyness for every word type:
+    - log-likelihood (Rayson & Garside), signed by direction
+    - chi-square on the 2×2 table (word vs other words × target vs reference)
+    - %DIFF (Gabrielatos & Marchi), inf when the word is absent from the reference
+    - log ratio (Hardie), with 0.5 added to zero frequencies
+    Empty table (no rows) when either side has no tokens.
+    """
+    words, a, b = align(target, reference)
+    a = a.astype(np.float64)
+    b = b.astype(np.float64)
+    n1, n2 = float(a.sum()), float(b.sum())
+    if not n1 or not n2:
+        # one side has no tokens (e.g. only stop words): no statistic is defined
+        none, no_counts = np.array([], dtype=np.float64), np.array([], dtype=np.int64)
+        return KeynessTable(
+            words=words[:0], target=no_counts, reference=no_counts,
+            target_total=int(n1), reference_total=int(n2),
+            log_likelihood=none, chi_square=none, pct_diff=none, log_ratio=none,
+        )
+    total = n1 + n2
+
+    e1 = n1 * (a + b) / total
+    e2 = n2 * (a + b) / total
+    ll = 2 * (_xlogx_over_e(a, e1) + _xlogx_over_e(b, e2))
+
+    # chi-square over all four cells (the "other words" cells use n - freq)
+    c1 = n1 - a
+    c2 = n2 - b
+    ec1 = n1 - e1
+    ec2 = n2 - e2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi2 = (
+            (a - e1) ** 2 / e1 + (b - e2) ** 2 / e2
+            + (c1 - ec1) ** 2 / ec1 + (c2 - ec2) ** 2 / ec2
+        )
+        nf1 = a / n1 * 1_000_000
+        nf2 = b / n2 * 1_000_000
+        pct = np.where(b > 0, (nf1 - nf2) * 100 / nf2, np.inf)
+
+    log_ratio = np.log2((np.where(a > 0, a, 0.5) / n1) / (np.where(b > 0, b, 0.5) / n2))
+    over = a / n1 >= b / n2
+
+    return KeynessTable(
+        words=words,
+        target=a.astype(np.int64),
+        reference=b.astype(np.int64),
+        target_total=int(n1),
+        reference_total=int(n2),
+        log_likelihood=np.where(over, ll, -ll),
+        chi_square=np.nan_to_num(chi2),
+        pct_diff=pct,
+        log_ratio=log_ratio,
+    )
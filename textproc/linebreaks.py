@@ -0,0 +1,109 @@
+"""
+Streaming line-break removal for uploaded files.
+
+Lines are read one at a time from the upload and joined by a generator that
+only holds the previous line, so a long PDF-to-text file is never loaded as
+one string or echoed back into the page. Rules:
+- dehyphenate: "lin-\\nguistics" -> "linguistics" (next line starts lowercase)
+- keep_paragraphs: blank lines stay as paragraph breaks
+- strip_page_numbers: lines like "12", "- 12 -", "Page 12", "12 of 40"
+- strip_headers: short lines that repeat on many pages (running headers/footers),
+  found by a first counting pass over the file
+A blank line at a page break (next to a stripped header, page number or form
+feed) only counts as a paragraph break when the text before it ends a sentence.
+"""
+import io
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator
+
+
+PAGE_NUMBER_RE = re.compile(
+    r"^(?:page\s+)?[-–—\s]*\d{1,4}[-–—\s]*(?:(?:of|/)\s*\d{1,4})?$",
+    re.IGNORECASE,
+)
+HEADER_MAX_CHARS = 80
+HEADER_MIN_REPEATS = 3
+PREVIEW_CHARS = 2000
+SENTENCE_END = tuple(".!?:;\"'”’)")
+
+
+@dataclass(frozen=True)
+class UnwrapRules:
+    dehyphenate: bool = True
+    keep_paragraphs: bool = True
+    strip_page_numbers: bool = True
+    strip_headers: bool = False
+    header_min_repeats: int = HEADER_MIN_REPEATS
+
+
+def header_key(line: str) -> str:
+    """Running headers differ only by page number: compare with digits masked."""
+    return re.sub(r"\d+", "#", line.strip().lower())
+
+def find_running_headers(lines: Iterable[str], min_repeats: int = HEADER_MIN_REPEATS) -> set[str]:
+    """header_key of short non-blank lines seen at least min_repeats times."""
+    counts = Counter(
+        header_key(line) for line in lines
+        if line.strip() and len(line.strip()) <= HEADER_MAX_CHARS
+    )
+    return {key for key, n in counts.items() if n >= min_repeats}
+
+def iter_unwrapped(lines: Iterable[str], rules: UnwrapRules = UnwrapRules(), headers: set[str] = frozenset()) -> Iterator[str]:
+    """Yield the joined text piece by piece (one piece per input line)."""
+    prev = None          # last kept line, not yet written
+    gap = False          # blank line(s) since prev
+    page_break = False   # stripped header/page number or form feed since prev
+    for raw in lines:
+        if "\f" in raw:
+            page_break = True
+        line = raw.strip()
+        if not line:
+            gap = prev is not None
+            continue
+        if (rules.strip_page_numbers and PAGE_NUMBER_RE.match(line)) or (headers and header_key(line) in headers):
+            page_break = True
+            continue
+        if prev is not None:
+            if gap and page_break and not prev.endswith(SENTENCE_END):
+                gap = False  # sentence runs on across the page break
+            if gap and rules.keep_paragraphs:
+                yield prev + "\n\n"
+            elif (
+                rules.dehyphenate and not gap
+                and prev.endswith("-") and prev[-2:-1].isalpha() and line[:1].islower()
+            ):
+                yield prev[:-1]
+            else:
+                yield prev + " "
+        prev, gap, page_break = line, False, False
+    if prev is not None:
+        yield prev + "\n"
+
+def _lines(raw: BinaryIO) -> Iterator[str]:
+    raw.seek(0)
+    reader = io.TextIOWrapper(raw, encoding="utf-8-sig", errors="replace")
+    try:
+        yield from reader
+    finally:
+        reader.detach()
+
+def unwrap_file(raw: BinaryIO, rules: UnwrapRules = UnwrapRules()) -> tuple[bytes, str]:
+    """
+    Unwrap an uploaded text file; returns (UTF-8 output, preview).
+    Two passes over the file when strip_headers is on (count, then write).
+    """
+    headers = find_running_headers(_lines(raw), rules.header_min_repeats) if rules.strip_headers else frozenset()
+    out = io.BytesIO()
+    writer = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    preview = []
+    preview_len = 0
+    for piece in iter_unwrapped(_lines(raw), rules, headers):
+        writer.write(piece)
+        if preview_len < PREVIEW_CHARS:
+            preview.append(piece)
+            preview_len += len(piece)
+    writer.flush()
+    writer.detach()
+    return out.getvalue(), "".join(preview)[:PREVIEW_CHARS]
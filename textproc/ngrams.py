@@ -0,0 +1,159 @@
+"""
+N-grams, lexical bundles and window collocations on integer-encoded tokens.
+
+Tokens are a NumPy array of vocabulary IDs. Each n-gram is split into a
+prefix (first n-1 words) and its last word; prefixes are packed into one
+integer column by column (prefix * V + next word, re-densified with
+np.unique each step so it never overflows), then counted with np.unique.
+No Python tuples are built except for the rows that are displayed.
+
+Association measures use the 2×2 table prefix × last word over all counted
+positions (for n = 2 with a window, over all word pairs within the window).
+Log-likelihood is signed (negative = fewer co-occurrences than expected).
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+RANK_FREQUENCY = "count"
+RANK_MI = "MI"
+RANK_T = "t-score"
+RANK_LL = "log-likelihood"
+RANKINGS = (RANK_FREQUENCY, RANK_MI, RANK_T, RANK_LL)
+
+
+@dataclass(frozen=True)
+class NGramTable:
+    n: int
+    window: int
+    components: np.ndarray   # (K, n) vocabulary IDs of each n-gram
+    counts: np.ndarray       # observed frequency
+    mi: np.ndarray
+    t_score: np.ndarray
+    log_likelihood: np.ndarray
+    positions: int           # number of counted n-gram positions
+
+    def __len__(self) -> int:
+        return int(self.counts.size)
+
+    def measure(self, name: str) -> np.ndarray:
+        return {
+            RANK_FREQUENCY: self.counts,
+            RANK_MI: self.mi,
+            RANK_T: self.t_score,
+            RANK_LL: self.log_likelihood,
+        }[name]
+
+    def min_count(self, n: int) -> "NGramTable":
+        if n <= 1:
+            return self
+        keep = self.counts >= n
+        return NGramTable(
+            self.n, self.window, self.components[keep], self.counts[keep],
+            self.mi[keep], self.t_score[keep], self.log_likelihood[keep], self.positions,
+        )
+
+    def top(self, rank_by: str = RANK_FREQUENCY, k: int | None = None) -> np.ndarray:
+        """Row order by the chosen measure (high→low), ties by frequency."""
+        order = np.lexsort((-self.counts, -self.measure(rank_by)))
+        return order if not k else order[:k]
+
+    def to_frame(self, vocab: np.ndarray, rank_by: str = RANK_FREQUENCY, k: int | None = None) -> pd.DataFrame:
+        rows = self.top(rank_by, k)
+        words = np.asarray(vocab)[self.components[rows]]
+        return pd.DataFrame({
+            "ngram": [" ".join(w) for w in words.tolist()],
+            "count": self.counts[rows],
+            "MI": self.mi[rows].round(3),
+            "t-score": self.t_score[rows].round(3),
+            "log-likelihood": self.log_likelihood[rows].round(3),
+        })
+
+
+def _dense(ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Map arbitrary integer IDs to 0..K-1 (returns unique IDs and inverse)."""
+    uniq, inverse = np.unique(ids, return_inverse=True)
+    return uniq, inverse.astype(np.int64)
+
+def _xlogx_over_e(o: np.ndarray, e: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(o > 0, o * np.log(o / e), 0.0)
+
+def _association(o11, r1, c1, total):
+    """MI, t-score and log-likelihood (G²) for vectors of 2×2 tables."""
+    o11 = o11.astype(np.float64)
+    r1 = r1.astype(np.float64)
+    c1 = c1.astype(np.float64)
+    e11 = r1 * c1 / total
+    mi = np.log2(o11 / e11)
+    t = (o11 - e11) / np.sqrt(o11)
+
+    o12, o21 = r1 - o11, c1 - o11
+    o22 = total - r1 - c1 + o11
+    e12 = r1 * (total - c1) / total
+    e21 = (total - r1) * c1 / total
+    e22 = (total - r1) * (total - c1) / total
+    ll = 2 * (
+        _xlogx_over_e(o11, e11) + _xlogx_over_e(o12, e12)
+        + _xlogx_over_e(o21, e21) + _xlogx_over_e(o22, e22)
+    )
+    # signed: negative when the words co-occur less often than expected
+    return mi, t, np.where(o11 < e11, -ll, ll)
+
+def count_ngrams(
+    codes: np.ndarray,
+    vocab_size: int,
+    n: int = 2,
+    window: int = 1,
+    stop_ids: np.ndarray | None = None,
+) -> NGramTable:
+    """
+    Count n-grams (n >= 2) over integer-encoded tokens.
+    - n = 2 with window > 1: every ordered pair (w_i, w_j) with 1 <= j - i <= window
+    - n >= 3: contiguous n-grams (lexical bundles); window is ignored
+    - stop_ids: n-grams containing any of these IDs are dropped
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    stop = np.zeros(vocab_size, dtype=bool)
+    if stop_ids is not None and len(stop_ids):
+        stop[np.asarray(stop_ids, dtype=np.int64)] = True
+
+    if n == 2:
+        lefts, rights = [], []
+        for k in range(1, max(1, window) + 1):
+            if k < codes.size:
+                lefts.append(codes[:-k])
+                rights.append(codes[k:])
+        rows = np.stack([np.concatenate(lefts), np.concatenate(rights)], axis=1) if lefts else np.empty((0, 2), np.int64)
+    else:
+        window = 1
+        m = codes.size - n + 1
+        rows = (
+            np.stack([codes[i:i + m] for i in range(n)], axis=1)
+            if m > 0 else np.empty((0, n), np.int64)
+        )
+
+    if rows.size:
+        rows = rows[~stop[rows].any(axis=1)]
+    if not rows.shape[0]:
+        empty = np.array([], dtype=np.float64)
+        return NGramTable(n, window, rows, np.array([], np.int64), empty, empty, empty, 0)
+
+    # pack the prefix column by column, re-densifying to keep IDs small
+    prefix = rows[:, 0]
+    for col in range(1, n - 1):
+        _, prefix = _dense(prefix * vocab_size + rows[:, col])
+    last = rows[:, -1]
+
+    keys, first, counts = np.unique(prefix * vocab_size + last, return_index=True, return_counts=True)
+    key_prefix = keys // vocab_size
+    key_last = keys % vocab_size
+
+    total = rows.shape[0]
+    prefix_freq = np.bincount(prefix)[key_prefix]
+    last_freq = np.bincount(last, minlength=vocab_size)[key_last]
+    mi, t, ll = _association(counts, prefix_freq, last_freq, total)
+
+    return NGramTable(n, window, rows[first], counts, mi, t, ll, total)
@@ -0,0 +1,168 @@
+"""
+Readability formulas from one set of extracted features.
+
+Words, sentences, syllables, polysyllables and letters are gathered once from
+the type counts (syllables looked up once per word type through a bounded
+memo), then every formula is plain arithmetic on those totals. Adding a
+formula does not add another pass over the text.
+"""
+import math
+from collections import Counter
+from dataclasses import astuple, dataclass
+from functools import lru_cache
+
+
+SYLLABLE_CACHE_SIZE = 200_000
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def syllable_count(word: str) -> int:
+    """Syllables in one lowercase word (textstat: CMU dict, then Pyphen)."""
+    import textstat
+    return max(1, textstat.syllable_count(word))
+
+
+@dataclass(frozen=True)
+class ReadabilityFeatures:
+    """Additive totals, so per-paragraph features can be summed."""
+    words: int = 0
+    sentences: int = 0
+    syllables: int = 0
+    polysyllables: int = 0   # words with 3+ syllables
+    letters: int = 0
+
+    def __add__(self, other: "ReadabilityFeatures") -> "ReadabilityFeatures":
+        return ReadabilityFeatures(*(a + b for a, b in zip(astuple(self), astuple(other))))
+
+    @property
+    def words_per_sentence(self) -> float:
+        # a text with no . ! ? counts as one sentence
+        return self.words / max(1, self.sentences)
+
+    @property
+    def syllables_per_word(self) -> float:
+        return self.syllables / self.words
+
+
+def features_from_counts(alpha_counts: Counter, sentence_count: int) -> ReadabilityFeatures:
+    """One pass over word types; each type's syllables weighted by its count."""
+    words = syllables = polysyllables = letters = 0
+    for word, count in alpha_counts.items():
+        syl = syllable_count(word)
+        words += count
+        syllables += syl * count
+        if syl >= 3:
+            polysyllables += count
+        letters += (len(word) - word.count("'")) * count
+    return ReadabilityFeatures(
+        words=words,
+        sentences=sentence_count,
+        syllables=syllables,
+        polysyllables=polysyllables,
+        letters=letters,
+    )
+
+def readability_features(source) -> ReadabilityFeatures:
+    """
+    Features for a TextAnalysis or CorpusStats.
+    TextAnalysis sums its cached per-paragraph features; anything else is
+    computed from alpha_counts/sentence_count.
+    """
+    features = getattr(source, "features", None)
+    if features is not None:
+        return features
+    return features_from_counts(source.alpha_counts, source.sentence_count)
+
+
+# ----------------------------
+# Formulas
+# ----------------------------
+def flesch_kincaid_grade(f: ReadabilityFeatures) -> float:
+    return 0.39 * f.words_per_sentence + 11.8 * f.syllables_per_word - 15.59
+
+def flesch_reading_ease(f: ReadabilityFeatures) -> float:
+    return 206.835 - 1.015 * f.words_per_sentence - 84.6 * f.syllables_per_word
+
+def gunning_fog(f: ReadabilityFeatures) -> float:
+    return 0.4 * (f.words_per_sentence + 100 * f.polysyllables / f.words)
+
+def smog_index(f: ReadabilityFeatures) -> float:
+    # SMOG is defined for 30-sentence samples; like textstat, 0 below 3 sentences
+    if f.sentences < 3:
+        return 0.0
+    return 1.043 * math.sqrt(f.polysyllables * 30 / f.sentences) + 3.1291
+
+def coleman_liau_index(f: ReadabilityFeatures) -> float:
+    letters_per_100 = f.letters / f.words * 100
+    sentences_per_100 = max(1, f.sentences) / f.words * 100
+    return 0.0588 * letters_per_100 - 0.296 * sentences_per_100 - 15.8
+
+def automated_readability_index(f: ReadabilityFeatures) -> float:
+    return 4.71 * (f.letters / f.words) + 0.5 * f.words_per_sentence - 21.43
+
+FORMULAS = {
+    "Flesch–Kincaid Grade": flesch_kincaid_grade,
+    "Flesch Reading Ease": flesch_reading_ease,
+    "Gunning Fog": gunning_fog,
+    "SMOG Index": smog_index,
+    "Coleman–Liau Index": coleman_liau_index,
+    "Automated Readability Index": automated_readability_index,
+}
+
+def all_scores(f: ReadabilityFeatures) -> dict:
+    """Every formula from the same features (NaN when there are no words)."""
+    if f.words == 0:
+        return {name: float("nan") for name in FORMULAS}
+    return {name: fn(f) for name, fn in FORMULAS.items()}
+
+def _ease_to_grade(score: float) -> list[int]:
+    # Flesch Reading Ease bands, as in textstat.text_standard
+    if 90 <= score < 100:
+        return [5]
+    if 80 <= score < 90:
+        return [6]
+    if 70 <= score < 80:
+        return [7]
+    if 60 <= score < 70:
+        return [8, 9]
+    if 50 <= score < 60:
+        return [10]
+    if 40 <= score < 50:
+        return [11]
+    if 30 <= score < 40:
+        return [12]
+    return [13]
+
+MIN_GRADE, MAX_GRADE = 1, 18   # textstat.text_standard bounds (kindergarten .. graduate school)
+
+def consensus_grade(scores: dict) -> int | None:
+    """
+    Most common grade across the formulas (textstat.text_standard style):
+    floor/ceil/round of each grade-level score plus the Reading Ease band.
+    None when no formula has a score (no words).
+    """
+    votes = []
+    for name, score in scores.items():
+        if math.isnan(score):
+            continue
+        if name == "Flesch Reading Ease":
+            votes.extend(_ease_to_grade(score))
+        else:
+            votes.extend([math.floor(score), math.ceil(score), round(score)])
+    if not votes:
+        return None
+    return Counter(votes).most_common(1)[0][0]
+
+def grade_suffix(n: int) -> str:
+    """Ordinal suffix: 1st, 2nd, 3rd, 4th ... 11th, 12th, 13th ... 21st."""
+    if n % 100 in (11, 12, 13):
+        return "th"
+    return {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+
+def grade_label(grade: int | None) -> str:
+    """Grade band in textstat.text_standard wording ("7th and 8th grade"); grade clamped to 1–18."""
+    if grade is None:
+        return "not enough text to estimate"
+    upper = max(MIN_GRADE, min(int(grade), MAX_GRADE))
+    lower = upper - 1
+    return f"{lower}{grade_suffix(lower)} and {upper}{grade_suffix(upper)} grade"
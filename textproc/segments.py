@@ -0,0 +1,105 @@
+"""
+Readability profile: grade, sentence length and TTR per segment of a text.
+
+The text is split into paragraphs or into windows of about N words (cut at
+sentence ends). Each segment is scored with batch.document_metrics and cached
+by content hash, so after an edit only new or changed segments are scored.
+Large sets of uncached segments are spread over a process pool.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .analysis import SENTENCE_RE, WORD_RE, LRUCache, paragraph_bounds, text_key
+from .batch import default_workers, document_metrics
+
+
+MODE_PARAGRAPH = "paragraph"
+MODE_WINDOW = "window"
+
+SEGMENT_CACHE_SIZE = 4096
+PARALLEL_MIN_WORDS = 100_000   # below this, pool start-up costs more than it saves
+PREVIEW_CHARS = 80
+
+_segment_cache = LRUCache(SEGMENT_CACHE_SIZE)
+
+
+def window_bounds(text: str, window_words: int = 250) -> list[tuple[int, int]]:
+    """(start, end) of consecutive sentence runs of at least window_words words."""
+    bounds = []
+    start = words = 0
+    for m in SENTENCE_RE.finditer(text):
+        words += len(WORD_RE.findall(m.group()))
+        if words >= window_words:
+            bounds.append((start, m.end()))
+            start, words = m.end(), 0
+    if WORD_RE.search(text, start):
+        if bounds and words < window_words // 2:
+            bounds[-1] = (bounds[-1][0], len(text))  # short tail joins the last window
+        else:
+            bounds.append((start, len(text)))
+    return bounds
+
+def segment_bounds(text: str, mode: str = MODE_PARAGRAPH, window_words: int = 250) -> list[tuple[int, int]]:
+    bounds = paragraph_bounds(text) if mode == MODE_PARAGRAPH else window_bounds(text, window_words)
+    return [(a, b) for a, b in bounds if WORD_RE.search(text, a, b)]
+
+def _score(segments: list[str], workers: int) -> tuple[list[dict], int]:
+    """
+    document_metrics for each segment text, cached by hash; misses are
+    computed together. Returns (rows, cache hits).
+    """
+    keys = [text_key(s) for s in segments]
+    results = [_segment_cache.get(k) for k in keys]
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        items = [(keys[i], segments[i]) for i in missing]
+        n_words = sum(len(segments[i]) for i in missing) // 6   # rough: ~6 chars per word
+        if workers > 1 and len(items) > 1 and n_words >= PARALLEL_MIN_WORDS:
+            chunksize = max(1, len(items) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                computed = list(pool.map(document_metrics, items, chunksize=chunksize))
+        else:
+            computed = [document_metrics(item) for item in items]
+        for i, row in zip(missing, computed):
+            _segment_cache.put(keys[i], row)
+            results[i] = row
+    return results, len(segments) - len(missing)
+
+def readability_profile(
+    text: str,
+    mode: str = MODE_PARAGRAPH,
+    window_words: int = 250,
+    workers: int | None = None,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    One row per segment: position, words, sentences, words/sentence, TTR,
+    Flesch–Kincaid grade and a short preview. Returns (table, stats).
+    """
+    start = time.perf_counter()
+    bounds = segment_bounds(text, mode, window_words)
+    segments = [text[a:b] for a, b in bounds]
+    metrics, hits = _score(segments, workers or default_workers())
+
+    rows = []
+    for i, ((a, _), seg, m) in enumerate(zip(bounds, segments, metrics), start=1):
+        rows.append({
+            "segment": i,
+            "start": a,
+            "words": m["words"],
+            "sentences": m["sentences"],
+            "words/sentence": m["words"] / max(1, m["sentences"]),
+            "ttr": m["ttr"],
+            "fk_grade": m["fk_grade"],
+            "preview": " ".join(seg[:PREVIEW_CHARS].split()),
+        })
+    table = pd.DataFrame(rows, columns=[
+        "segment", "start", "words", "sentences", "words/sentence", "ttr", "fk_grade", "preview",
+    ])
+    stats = {
+        "segments": len(segments),
+        "cached": hits,
+        "seconds": time.perf_counter() - start,
+    }
+    return table, stats
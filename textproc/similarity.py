@@ -0,0 +1,202 @@
+"""
+Near-duplicate and overlap detection for a set of documents.
+
+Each document is shingled into word n-grams hashed to 64-bit integers, then
+summarised by a MinHash signature (num_perm multiply-shift hashes, minimum
+over the shingles, all as NumPy array operations). LSH banding groups
+documents whose signatures agree on a whole band, so only those candidate
+pairs are compared, not all pairs. Candidates are then confirmed with exact
+Jaccard/containment on the shingle sets and TF-IDF cosine on word counts.
+
+A source reading is compared with every document directly: a summary that
+copies part of a long source has low Jaccard but high containment, which
+banding would miss.
+"""
+import hashlib
+import math
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .analysis import WORD_RE
+
+
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+SEED = 316
+RECALL = 0.99                       # LSH: chance a pair at the threshold becomes a candidate
+_PRIME = np.uint64(0x100000001B3)   # n-gram hash combiner (FNV prime)
+_BLOCK = 8192                       # shingles per MinHash block (bounds the temp matrix)
+
+
+def _word_hashes(words: np.ndarray) -> np.ndarray:
+    """Stable 64-bit hash per word (blake2b; independent of PYTHONHASHSEED)."""
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(w.encode("utf-8"), digest_size=8).digest(), "little") for w in words.tolist()],
+        dtype=np.uint64,
+    )
+
+def shingle_hashes(tokens: list[str], n: int = SHINGLE_SIZE) -> np.ndarray:
+    """Sorted unique hashes of the word n-grams (the whole text when shorter than n)."""
+    if not tokens:
+        return np.array([], dtype=np.uint64)
+    vocab, inverse = np.unique(np.array(tokens, dtype=str), return_inverse=True)
+    h = _word_hashes(vocab)[inverse]
+    n = min(n, h.size)
+    m = h.size - n + 1
+    acc = h[:m].copy()
+    for k in range(1, n):
+        acc = acc * _PRIME + h[k:k + m]   # uint64 wrap-around
+    return np.unique(acc)
+
+
+@dataclass(frozen=True)
+class Document:
+    doc_id: str
+    shingles: np.ndarray   # sorted unique uint64
+    terms: np.ndarray      # word types
+    counts: np.ndarray     # their counts
+
+def prepare(doc_id: str, text: str, n: int = SHINGLE_SIZE) -> Document:
+    tokens = WORD_RE.findall(text.lower())
+    terms, counts = np.unique(np.array(tokens, dtype=str), return_counts=True) if tokens else (
+        np.array([], dtype="U1"), np.array([], dtype=np.int64))
+    return Document(doc_id, shingle_hashes(tokens, n), terms, counts)
+
+
+# ----------------------------
+# MinHash + LSH
+# ----------------------------
+def _hash_params(num_perm: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)  # odd
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+def minhash(shingles: np.ndarray, num_perm: int = NUM_PERM, seed: int = SEED) -> np.ndarray:
+    """uint32 signature: per hash function, the minimum of (a*x + b) >> 32 over the shingles."""
+    a, b = _hash_params(num_perm, seed)
+    sig = np.full(num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+    for start in range(0, shingles.size, _BLOCK):
+        x = shingles[start:start + _BLOCK]
+        h = ((a[:, None] * x[None, :] + b[:, None]) >> np.uint64(32)).astype(np.uint32)
+        np.minimum(sig, h.min(axis=1), out=sig)
+    return sig
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM, recall: float = RECALL) -> tuple[int, int]:
+    """
+    (bands, rows) with bands * rows <= num_perm: the most selective banding
+    (most rows per band) that still makes a pair at `threshold` a candidate
+    with probability >= recall, i.e. 1 - (1 - t^r)^b >= recall.
+    """
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            return bands, rows
+    return num_perm, 1
+
+def candidate_pairs(signatures: np.ndarray, bands: int, rows: int) -> set[tuple[int, int]]:
+    """Index pairs (i < j) that share at least one identical band."""
+    pairs = set()
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        _, inverse = np.unique(keys, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        groups = np.split(order, np.flatnonzero(np.diff(inverse[order])) + 1)
+        for group in groups:
+            if group.size > 1:
+                pairs.update(combinations(sorted(group.tolist()), 2))
+    return pairs
+
+
+# ----------------------------
+# Exact measures
+# ----------------------------
+def overlap(a: np.ndarray, b: np.ndarray) -> tuple[float, float]:
+    """(Jaccard, containment) of two sorted shingle sets; containment = shared / smaller set."""
+    if not a.size or not b.size:
+        return 0.0, 0.0
+    shared = np.intersect1d(a, b, assume_unique=True).size
+    return shared / (a.size + b.size - shared), shared / min(a.size, b.size)
+
+def tfidf_vectors(docs: list[Document]) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Per document: (sorted term IDs, L2-normalised TF-IDF weights), smooth IDF over the set."""
+    if not docs:
+        return []
+    vocab, inverse = np.unique(np.concatenate([d.terms for d in docs]), return_inverse=True)
+    df = np.bincount(inverse, minlength=vocab.size)
+    idf = np.log((1 + len(docs)) / (1 + df)) + 1
+    vectors, start = [], 0
+    for d in docs:
+        ids = inverse[start:start + d.terms.size]
+        start += d.terms.size
+        w = d.counts * idf[ids]
+        norm = math.sqrt(float(w @ w)) or 1.0
+        vectors.append((ids, w / norm))
+    return vectors
+
+def cosine(u: tuple[np.ndarray, np.ndarray], v: tuple[np.ndarray, np.ndarray]) -> float:
+    _, iu, iv = np.intersect1d(u[0], v[0], assume_unique=True, return_indices=True)
+    return float(u[1][iu] @ v[1][iv])
+
+
+# ----------------------------
+# Class-set check
+# ----------------------------
+def find_overlaps(
+    documents: Iterable[tuple[str, str]],
+    threshold: float = 0.5,
+    n: int = SHINGLE_SIZE,
+    num_perm: int = NUM_PERM,
+    source: str | None = None,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Pairs of documents (and document vs source) whose Jaccard or containment
+    on word n-grams reaches threshold. Returns (pairs table, stats).
+    """
+    docs = [prepare(doc_id, text, n) for doc_id, text in documents]
+    src = prepare("(source)", source, n) if source and source.strip() else None
+    everything = docs + ([src] if src is not None else [])
+    vectors = tfidf_vectors(everything)
+
+    bands, rows = lsh_params(threshold, num_perm)
+    signatures = np.stack([minhash(d.shingles, num_perm) for d in docs]) if docs else np.empty((0, num_perm), np.uint32)
+    candidates = candidate_pairs(signatures, bands, rows)
+
+    checks = sorted(candidates)
+    if src is not None:
+        checks += [(i, len(docs)) for i in range(len(docs))]
+
+    results = []
+    for i, j in checks:
+        a, b = everything[i], everything[j]
+        jac, cont = overlap(a.shingles, b.shingles)
+        if max(jac, cont) < threshold:
+            continue
+        estimate = float(np.mean(signatures[i] == signatures[j])) if j < len(docs) else float("nan")
+        results.append({
+            "document A": a.doc_id,
+            "document B": b.doc_id,
+            "Jaccard": round(jac, 4),
+            "containment": round(cont, 4),
+            "TF-IDF cosine": round(cosine(vectors[i], vectors[j]), 4),
+            "MinHash estimate": round(estimate, 4),
+        })
+
+    table = pd.DataFrame(results, columns=[
+        "document A", "document B", "Jaccard", "containment", "TF-IDF cosine", "MinHash estimate",
+    ])
+    table = table.sort_values(["containment", "Jaccard"], ascending=False, kind="stable").reset_index(drop=True)
+    stats = {
+        "documents": len(docs),
+        "bands": bands,
+        "rows": rows,
+        "candidates": len(candidates),
+        "all_pairs": len(docs) * (len(docs) - 1) // 2,
+        "flagged": len(table),
+    }
+    return table, stats
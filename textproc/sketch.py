@@ -0,0 +1,78 @@
+"""
+Bounded-memory heavy hitters (Space-Saving summary).
+
+A SpaceSaving summary monitors at most `capacity` words. Each chunk's exact
+Counter is merged in as a weighted update: monitored words add their chunk
+count; a new word enters with the current minimum as its count and as its
+error, and only the `capacity` largest estimates are kept. So memory stays
+fixed however large the corpus is, and for every kept word
+
+    true count <= count <= true count + error
+
+while no word that dropped out occurs more than `floor` times.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .frequency import FrequencyTable
+
+
+DEFAULT_CAPACITY = 10_000
+
+
+@dataclass
+class SpaceSaving:
+    capacity: int = DEFAULT_CAPACITY
+    words: np.ndarray = field(default_factory=lambda: np.array([], dtype="U1"))   # sorted A→Z
+    counts: np.ndarray = field(default_factory=lambda: np.array([], dtype=np.int64))   # over-estimates
+    errors: np.ndarray = field(default_factory=lambda: np.array([], dtype=np.int64))   # max over-count per word
+    total: int = 0   # tokens seen
+
+    def __len__(self) -> int:
+        return int(self.words.size)
+
+    @property
+    def floor(self) -> int:
+        """Upper bound on the count of any word that is not monitored."""
+        return int(self.counts.min()) if len(self) >= self.capacity else 0
+
+    def update(self, counts: Counter) -> None:
+        """Merge one chunk's exact counts."""
+        if not counts:
+            return
+        new_words = np.array(list(counts), dtype=str)
+        new_counts = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        self.total += int(new_counts.sum())
+
+        floor = self.floor
+        n_old = len(self)
+        words, inverse = np.unique(np.concatenate([self.words, new_words]), return_inverse=True)
+        est = np.full(words.size, floor, dtype=np.int64)
+        err = np.full(words.size, floor, dtype=np.int64)
+        est[inverse[:n_old]] = self.counts
+        err[inverse[:n_old]] = self.errors
+        est[inverse[n_old:]] += new_counts   # Counter keys are distinct
+
+        if words.size > self.capacity:
+            keep = np.sort(np.argpartition(-est, self.capacity - 1)[:self.capacity])
+            words, est, err = words[keep], est[keep], err[keep]
+        self.words, self.counts, self.errors = words, est, err
+
+    def table(self) -> FrequencyTable:
+        """Estimated counts as a frequency table (upper bounds)."""
+        return FrequencyTable(self.words, self.counts)
+
+    def error_of(self, words) -> np.ndarray:
+        """Max over-count for each of `words` (floor for words not monitored)."""
+        words = np.asarray(words, dtype=str)
+        if not len(self):
+            return np.zeros(words.size, dtype=np.int64)
+        pos = np.clip(np.searchsorted(self.words, words), 0, len(self) - 1)
+        found = self.words[pos] == words
+        return np.where(found, self.errors[pos], self.floor)
+
+    def guaranteed(self) -> np.ndarray:
+        """Mask of monitored words that certainly occur more often than any unmonitored word."""
+        return self.counts - self.errors > self.floor
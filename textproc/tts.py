@@ -0,0 +1,353 @@
+"""
+Text-to-speech with a shared on-disk MP3 cache.
+
+Audio is content-addressed: the file name is a hash of (text, lang, tld,
+slow), so an identical request from any session is served from disk. The
+cache directory is kept under max_bytes by evicting least recently used
+files (file mtime is touched on every hit). Concurrent requests for the
+same key share one synthesis: the first caller synthesizes, the others
+wait for its result.
+
+Long texts are split into sentences and synthesized concurrently on a small
+thread pool (each sentence through the cache); stream_sentences yields the
+MP3 pieces in reading order, so the first one can play while the rest are
+still being synthesized. MP3 frames concatenate into one playable file.
+
+build_audio_pack synthesizes many items (flashcard fields, word-list lines)
+the same way and writes them into one ZIP as they finish. Every item goes
+through the cache, so a pack interrupted half-way resumes where it stopped.
+
+The synthesizer is a pluggable backend (anything with
+synthesize(text, lang, tld, slow) -> MP3 bytes): gTTS over the network by
+default, or SilenceBackend, an offline stand-in for tests and demos.
+"""
+import csv
+import hashlib
+import io
+import os
+import re
+import threading
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, Protocol
+
+import pandas as pd
+
+
+DEFAULT_DIR = os.environ.get(
+    "TEXTPROC_TTS_CACHE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "tts_cache"),
+)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_TLD = "com"   # gTTS's default host
+TTS_WORKERS = 4       # concurrent requests per passage (network-bound; kept small for the TTS host)
+MIN_CHUNK_CHARS = 40  # very short sentences are joined with the next one
+PACK_WORKERS = 8      # concurrent requests for an audio pack (short items)
+
+ORIGIN_CACHED, ORIGIN_SHARED, ORIGIN_SYNTHESIZED = "cached", "shared", "synthesized"
+
+# sentence end: . ! ? … (plus closing quotes/brackets) before whitespace, or CJK 。！？ anywhere
+SENTENCE_END_RE = re.compile(r"""(?<=[.!?…])\s+|(?<=[.!?…]["'”’)\]])\s+|(?<=[。！？])\s*""")
+
+
+class TTSBackend(Protocol):
+    def synthesize(self, text: str, lang: str, tld: str, slow: bool) -> bytes: ...
+
+
+class GTTSBackend:
+    """Google Translate TTS (network)."""
+
+    def synthesize(self, text: str, lang: str, tld: str, slow: bool) -> bytes:
+        from gtts import gTTS
+
+        out = io.BytesIO()
+        gTTS(text=text, lang=lang, tld=tld, slow=slow).write_to_fp(out)
+        return out.getvalue()
+
+
+class SilenceBackend:
+    """
+    Offline stand-in: silent MP3 (MPEG-1 Layer III, 128 kbps, 44.1 kHz),
+    about 0.4 s per word, so players and downloads behave as with real audio.
+    """
+    FRAME = b"\xff\xfb\x90\x64" + bytes(413)   # one 417-byte frame, ~26 ms
+    FRAMES_PER_WORD = 15
+
+    def __init__(self):
+        self.calls = 0
+
+    def synthesize(self, text: str, lang: str, tld: str, slow: bool) -> bytes:
+        self.calls += 1
+        words = max(1, len(text.split()))
+        return self.FRAME * (words * self.FRAMES_PER_WORD * (2 if slow else 1))
+
+
+BACKENDS = {"gtts": GTTSBackend, "silence": SilenceBackend}
+
+def default_backend() -> TTSBackend:
+    """TEXTPROC_TTS_BACKEND=silence selects the offline stand-in (default: gtts)."""
+    return BACKENDS[os.environ.get("TEXTPROC_TTS_BACKEND", "gtts")]()
+
+
+def audio_key(text: str, lang: str, tld: str | None = None, slow: bool = False) -> str:
+    """Content address of one synthesis request."""
+    raw = "\x1f".join([text.strip(), lang, tld or DEFAULT_TLD, "slow" if slow else "normal"])
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class AudioCache:
+    """MP3 files under one directory; safe to share across Streamlit sessions."""
+
+    def __init__(self, path: str = DEFAULT_DIR, backend: TTSBackend | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.backend = backend or default_backend()
+        self.max_bytes = max_bytes
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending: dict[str, Future] = {}
+        self._stats = {"hits": 0, "misses": 0, "shared": 0, "evictions": 0}
+        # key -> size, for files already on disk (evicted oldest-first by mtime)
+        self._sizes = {}
+        for entry in os.scandir(path):
+            if entry.is_file() and entry.name.endswith(".mp3"):
+                self._sizes[entry.name[:-4]] = entry.stat().st_size
+        self._bytes = sum(self._sizes.values())
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.mp3")
+
+    def _read(self, key: str) -> bytes | None:
+        try:
+            with open(self._file(key), "rb") as f:
+                data = f.read()
+            os.utime(self._file(key))   # mark as recently used
+            return data
+        except FileNotFoundError:
+            return None
+
+    def _store(self, key: str, data: bytes) -> None:
+        tmp = self._file(key) + f".{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._file(key))   # readers never see a partial file
+        with self._lock:
+            self._bytes += len(data) - self._sizes.get(key, 0)
+            self._sizes[key] = len(data)
+            if self._bytes > self.max_bytes:
+                self._evict(keep=key)
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used files until under max_bytes (caller holds the lock)."""
+        def last_used(k):
+            try:
+                return os.stat(self._file(k)).st_mtime
+            except FileNotFoundError:
+                return 0.0
+        for k in sorted(self._sizes, key=last_used):
+            if self._bytes <= self.max_bytes:
+                break
+            if k == keep:
+                continue
+            try:
+                os.remove(self._file(k))
+            except FileNotFoundError:
+                pass
+            self._bytes -= self._sizes.pop(k)
+            self._stats["evictions"] += 1
+
+    def get(self, text: str, lang: str, tld: str | None = None, slow: bool = False) -> bytes:
+        """MP3 bytes for the text, synthesized at most once per key (backend errors propagate)."""
+        return self.fetch(text, lang, tld, slow)[0]
+
+    def fetch(self, text: str, lang: str, tld: str | None = None, slow: bool = False) -> tuple[bytes, str]:
+        """
+        (MP3 bytes, how they were obtained) for this one call: ORIGIN_CACHED (from
+        disk), ORIGIN_SHARED (waited on another caller's synthesis) or ORIGIN_SYNTHESIZED.
+        """
+        key = audio_key(text, lang, tld, slow)
+        data = self._read(key) if key in self._sizes else None
+        if data is not None:
+            with self._lock:
+                self._stats["hits"] += 1
+            return data, ORIGIN_CACHED
+
+        with self._lock:
+            # another caller may have stored it since the check above
+            data = self._read(key) if key in self._sizes else None
+            if data is not None:
+                self._stats["hits"] += 1
+                return data, ORIGIN_CACHED
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = Future()
+                self._stats["misses"] += 1
+            else:
+                self._stats["shared"] += 1
+        if not owner:
+            return pending.result(), ORIGIN_SHARED
+
+        try:
+            data = self.backend.synthesize(text.strip(), lang, tld or DEFAULT_TLD, slow)
+            self._store(key, data)
+            pending.set_result(data)
+            return data, ORIGIN_SYNTHESIZED
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def stats(self) -> dict:
+        """hits (from disk), misses (synthesized), shared (waited on another request), evictions, files, bytes."""
+        with self._lock:
+            return {**self._stats, "files": len(self._sizes), "bytes": self._bytes}
+
+    def clear(self) -> None:
+        with self._lock:
+            for k in list(self._sizes):
+                try:
+                    os.remove(self._file(k))
+                except FileNotFoundError:
+                    pass
+            self._sizes.clear()
+            self._bytes = 0
+
+
+def split_sentences(text: str, min_chars: int = MIN_CHUNK_CHARS) -> list[str]:
+    """Sentence chunks for synthesis; fragments shorter than min_chars are merged forward."""
+    chunks, buf = [], ""
+    for part in SENTENCE_END_RE.split(text.strip()):
+        part = " ".join(part.split())
+        if not part:
+            continue
+        buf = f"{buf} {part}" if buf else part
+        if len(buf) >= min_chars:
+            chunks.append(buf)
+            buf = ""
+    if buf:
+        if chunks and len(buf) < min_chars // 2:
+            chunks[-1] = f"{chunks[-1]} {buf}"
+        else:
+            chunks.append(buf)
+    return chunks
+
+def stream_sentences(
+    cache: AudioCache,
+    text: str,
+    lang: str,
+    tld: str | None = None,
+    slow: bool = False,
+    workers: int = TTS_WORKERS,
+) -> Iterator[bytes]:
+    """
+    MP3 bytes per sentence chunk, in order, synthesized concurrently through
+    the cache. The first piece is yielded as soon as it is ready; joining all
+    pieces gives the whole passage.
+    """
+    chunks = split_sentences(text)
+    if len(chunks) <= 1:
+        if chunks:
+            yield cache.get(chunks[0], lang, tld, slow)
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+        futures = [pool.submit(cache.get, chunk, lang, tld, slow) for chunk in chunks]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:   # stop early (error / consumer gave up): drop queued work
+                future.cancel()
+
+
+# ----------------------------
+# Audio packs (many short items)
+# ----------------------------
+def pack_items_from_table(df: pd.DataFrame, columns: list[str]) -> list[tuple[str, str]]:
+    """(label, text) per non-empty cell of the columns, row by row; label = row number + column."""
+    items = []
+    for row, values in enumerate(df[columns].itertuples(index=False), start=1):
+        for col, value in zip(columns, values):
+            if isinstance(value, str) and value.strip():
+                items.append((f"{row:03d}_{col}", value.strip()))
+    return items
+
+def pack_items_from_lines(text: str) -> list[tuple[str, str]]:
+    """(label, text) per non-empty line of a word list."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return [(f"{i:03d}", line) for i, line in enumerate(lines, start=1)]
+
+def _file_name(label: str, text: str) -> str:
+    slug = re.sub(r"[^\w]+", "_", text.lower()).strip("_")[:40]
+    return f"{label}_{slug}.mp3" if slug else f"{label}.mp3"
+
+def build_audio_pack(
+    cache: AudioCache,
+    items: Iterable[tuple[str, str]],
+    lang: str,
+    tld: str | None = None,
+    slow: bool = False,
+    workers: int = PACK_WORKERS,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> tuple[bytes, dict]:
+    """
+    ZIP of one MP3 per (label, text) item plus manifest.csv, written as items
+    finish (MP3s are stored, not recompressed). A failed item is listed in the
+    manifest and stats and does not stop the pack; running again retries only
+    what is not cached yet. Returns (zip bytes, stats); synthesized/reused
+    count this pack's own items (the cache may be shared with other sessions).
+    """
+    items = list(items)
+    start = time.perf_counter()
+    out = io.BytesIO()
+    manifest, failed = [], []
+    origins = Counter()
+    pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(items) or 1)))
+    try:
+        futures = {pool.submit(cache.fetch, text, lang, tld, slow): (label, text) for label, text in items}
+        with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as zf:
+            for done, future in enumerate(as_completed(futures), start=1):
+                label, text = futures[future]
+                try:
+                    audio, origin = future.result()
+                except Exception as e:
+                    failed.append(label)
+                    manifest.append((label, text, "", f"error: {e}"))
+                else:
+                    origins[origin] += 1
+                    name = _file_name(label, text)
+                    zf.writestr(name, audio)
+                    manifest.append((label, text, name, origin))
+                if on_progress is not None:
+                    on_progress(done, len(items))
+            listing = io.StringIO()
+            writer = csv.writer(listing)
+            writer.writerow(["item", "text", "file", "status"])
+            writer.writerows(sorted(manifest))
+            zf.writestr("manifest.csv", "\ufeff" + listing.getvalue())
+    finally:
+        # interrupted (e.g. Streamlit rerun): drop queued items; finished ones stay cached
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    stats = {
+        "items": len(items),
+        "synthesized": origins[ORIGIN_SYNTHESIZED],
+        "reused": origins[ORIGIN_CACHED] + origins[ORIGIN_SHARED],
+        "failed": failed,
+        "seconds": time.perf_counter() - start,
+    }
+    return out.getvalue(), stats
+
+
+_caches: dict = {}
+_caches_lock = threading.Lock()
+
+def open_audio_cache(path: str = DEFAULT_DIR) -> AudioCache:
+    """One shared AudioCache per directory (so concurrent sessions share pending syntheses)."""
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = AudioCache(path)
+        return _caches[path]
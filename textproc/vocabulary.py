@@ -0,0 +1,173 @@
+"""
+Vocabulary profile: share of tokens in each frequency band (K1, K2, AWL, ...).
+
+Band word lists are plain .txt files (one band per file) compiled once into a
+BandLexicon: one sorted word array plus a parallel int8 band array. Profiling
+a text is then a np.searchsorted of its word types against that array and a
+np.bincount of their counts per band, so a class set costs a few milliseconds
+per essay and no list is re-read on rerun.
+"""
+import os
+import re
+from dataclasses import dataclass
+from importlib import resources
+
+import numpy as np
+import pandas as pd
+
+from .analysis import LRUCache, text_key
+from .frequency import FrequencyTable
+
+
+WORDLIST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "wordlists")
+OFF_LIST = "Off-list"
+
+_ENTRY_RE = re.compile(r"[^\s,;]+")
+_PREFIX_RE = re.compile(r"^\d+[_\-\s.]*")
+
+
+@dataclass(frozen=True)
+class BandLexicon:
+    names: tuple          # band names in priority order; index len(names) = off-list
+    words: np.ndarray     # sorted unique words
+    bands: np.ndarray     # int8 band index per word (first list that has it)
+
+    def __len__(self) -> int:
+        return int(self.words.size)
+
+    @property
+    def off_list(self) -> int:
+        return len(self.names)
+
+    def band_of(self, words) -> np.ndarray:
+        """Band index for each word (off_list when not in any list)."""
+        words = np.asarray(words, dtype=str)
+        if not len(self) or not words.size:
+            return np.full(words.size, self.off_list, dtype=np.int8)
+        pos = np.clip(np.searchsorted(self.words, words), 0, len(self) - 1)
+        return np.where(self.words[pos] == words, self.bands[pos], self.off_list).astype(np.int8)
+
+
+def parse_wordlist(text: str) -> list[str]:
+    """Words from a list file: whitespace/comma separated, '#' starts a comment."""
+    words = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].lower()
+        words.extend(_ENTRY_RE.findall(line))
+    return words
+
+def band_name(filename: str) -> str:
+    """'2_K2.txt' -> 'K2' (a leading number only sets the order)."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return _PREFIX_RE.sub("", stem) or stem
+
+def compile_lexicon(lists: dict) -> BandLexicon:
+    """Band name -> list text, in priority order; a word belongs to the first band listing it."""
+    names = tuple(lists)
+    words, bands = [], []
+    for i, text in enumerate(lists.values()):
+        entries = parse_wordlist(text)
+        words.extend(entries)
+        bands.extend([i] * len(entries))
+    if not words:
+        return BandLexicon(names, np.array([], dtype="U1"), np.array([], dtype=np.int8))
+    # np.unique keeps the first occurrence index -> lowest band wins
+    uniq, first = np.unique(np.array(words, dtype=str), return_index=True)
+    return BandLexicon(names, uniq, np.asarray(bands, dtype=np.int8)[first])
+
+
+LEXICON_CACHE_SIZE = 8
+_lexicon_cache = LRUCache(LEXICON_CACHE_SIZE)
+
+def cached_lexicon(lists: dict) -> BandLexicon:
+    """compile_lexicon() cached by list contents (shared across sessions)."""
+    key = text_key("\0".join(f"{name}\0{text}" for name, text in lists.items()))
+    lexicon = _lexicon_cache.get(key)
+    if lexicon is None:
+        lexicon = compile_lexicon(lists)
+        _lexicon_cache.put(key, lexicon)
+    return lexicon
+
+def read_wordlists(directory: str = WORDLIST_DIR) -> dict:
+    """
+    Band name -> text for every .txt in directory (sorted by file name).
+    Falls back to the Dale–Chall easy-word list shipped with textstat.
+    """
+    lists = {}
+    if os.path.isdir(directory):
+        for filename in sorted(os.listdir(directory)):
+            if filename.lower().endswith(".txt"):
+                with open(os.path.join(directory, filename), encoding="utf-8-sig") as f:
+                    lists[band_name(filename)] = f.read()
+    if not lists:
+        try:
+            easy = resources.files("textstat") / "resources" / "en" / "easy_words.txt"
+            lists["Dale–Chall easy"] = easy.read_text(encoding="utf-8")
+        except (ModuleNotFoundError, FileNotFoundError):
+            pass
+    return lists
+
+def default_lexicon(directory: str = WORDLIST_DIR) -> BandLexicon:
+    return cached_lexicon(read_wordlists(directory))
+
+
+# ----------------------------
+# Profiling
+# ----------------------------
+def _lookup_forms(words: np.ndarray) -> np.ndarray:
+    # possessives count as their base word: teacher's / learners' -> teacher / learners
+    return np.array(
+        [w[:-2] if w.endswith("'s") else w.rstrip("'") for w in words.tolist()],
+        dtype=str,
+    ) if words.size else words
+
+@dataclass(frozen=True)
+class VocabularyProfile:
+    names: tuple             # band names + OFF_LIST
+    tokens: np.ndarray       # tokens per band
+    types: np.ndarray        # word types per band
+    table: FrequencyTable    # the profiled types
+    bands: np.ndarray        # band index per type in table
+
+    @property
+    def n_tokens(self) -> int:
+        return int(self.tokens.sum())
+
+    def coverage(self) -> np.ndarray:
+        """% of tokens per band."""
+        return self.tokens * 100 / max(1, self.n_tokens)
+
+    def to_frame(self) -> pd.DataFrame:
+        cov = self.coverage()
+        return pd.DataFrame({
+            "band": list(self.names),
+            "tokens": self.tokens,
+            "token %": cov.round(2),
+            "cumulative %": np.cumsum(cov).round(2),
+            "types": self.types,
+        })
+
+    def band_words(self, band: int) -> FrequencyTable:
+        """Word types in one band (e.g. off-list words), most frequent first."""
+        return self.table._take(self.bands == band).sorted()
+
+
+def profile(table: FrequencyTable, lexicon: BandLexicon) -> VocabularyProfile:
+    """Profile a frequency table (word types + counts) against the band lists."""
+    bands = lexicon.band_of(_lookup_forms(table.words))
+    n_bands = lexicon.off_list + 1
+    return VocabularyProfile(
+        names=lexicon.names + (OFF_LIST,),
+        tokens=np.bincount(bands, weights=table.counts, minlength=n_bands).astype(np.int64),
+        types=np.bincount(bands, minlength=n_bands).astype(np.int64),
+        table=table,
+        bands=bands,
+    )
+
+def profile_row(doc_id: str, table: FrequencyTable, lexicon: BandLexicon) -> dict:
+    """One row of a class-set profile: tokens and % per band."""
+    result = profile(table, lexicon)
+    row = {"document": doc_id, "tokens": result.n_tokens}
+    for name, pct in zip(result.names, result.coverage()):
+        row[f"{name} %"] = round(float(pct), 2)
+    return row
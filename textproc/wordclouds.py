@@ -0,0 +1,77 @@
+"""
+Word cloud rendering with shared caches.
+
+A text's word frequencies are computed once (WordCloud's own tokenizer, so
+stop words and collocations match .generate()) and cached by content hash.
+Rendered clouds are cached as PNG bytes, keyed by text hash and the drawing
+settings, and written straight from WordCloud.to_image() with no matplotlib
+figure. Both caches are module-level LRUs, so a class generating clouds of
+the same reading shares them; memory stays bounded by the entry counts
+(a 1000×500 PNG is a few hundred KB).
+"""
+import io
+
+from .analysis import LRUCache, text_key
+
+
+WIDTH, HEIGHT = 1000, 500
+RANDOM_STATE = 316           # fixed layout: a cached cloud looks the same as a fresh one
+FREQUENCY_CACHE_SIZE = 64
+IMAGE_CACHE_SIZE = 32
+
+_frequency_cache = LRUCache(FREQUENCY_CACHE_SIZE)
+_image_cache = LRUCache(IMAGE_CACHE_SIZE)
+
+
+def word_frequencies(text: str, key: str | None = None) -> dict:
+    """{word: count} as WordCloud.generate() would see it (cached by content hash)."""
+    from wordcloud import WordCloud
+
+    key = key or text_key(text)
+    freqs = _frequency_cache.get(key)
+    if freqs is None:
+        freqs = WordCloud().process_text(text)
+        _frequency_cache.put(key, freqs)
+    return freqs
+
+def render_png(
+    text: str,
+    max_words: int = 120,
+    background: str = "white",
+    colormap: str = "viridis",
+    width: int = WIDTH,
+    height: int = HEIGHT,
+) -> bytes | None:
+    """PNG bytes of the cloud (cached per text and settings); None when the text has no words."""
+    from wordcloud import WordCloud
+
+    key = text_key(text)
+    cache_key = (key, int(max_words), background, colormap, int(width), int(height))
+    png = _image_cache.get(cache_key)
+    if png is not None:
+        return png
+
+    freqs = word_frequencies(text, key)
+    if not freqs:
+        return None
+    cloud = WordCloud(
+        width=width,
+        height=height,
+        background_color=background,
+        max_words=max_words,
+        colormap=colormap,
+        random_state=RANDOM_STATE,
+    ).generate_from_frequencies(freqs)
+    out = io.BytesIO()
+    cloud.to_image().save(out, format="PNG")
+    png = out.getvalue()
+    _image_cache.put(cache_key, png)
+    return png
+
+def cache_stats() -> dict:
+    """Rendered-cloud cache: hits (reused), misses (rendered), entries; shared by all sessions."""
+    return _image_cache.stats()
+
+def clear_cache() -> None:
+    _frequency_cache.clear()
+    _image_cache.clear()
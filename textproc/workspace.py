@@ -0,0 +1,287 @@
+"""
+Corpus workspace: saved texts in a local SQLite file.
+
+Each document is stored once (deduplicated by content hash) with metadata
+(title, student, week, genre). Its tokens are stored as int32 blobs of IDs
+into one shared vocabulary table, so a saved subset is loaded with
+np.frombuffer and never re-tokenized. An FTS5 index over title and text
+supports search.
+
+A WorkspaceSubset exposes the same fields the tabs read from TextAnalysis
+(word_table, alpha_table, word_codes, alpha_codes, features, ...), so the
+frequency, TTR, readability and n-gram views run on it unchanged.
+"""
+import os
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .analysis import ALPHA_WORD_RE, WORD_RE, LRUCache, count_sentences, text_key
+from .frequency import FrequencyTable
+from .readability import ReadabilityFeatures, features_from_counts
+
+
+DEFAULT_PATH = os.environ.get(
+    "TEXTPROC_WORKSPACE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "workspace.sqlite"),
+)
+META_COLUMNS = ("title", "student", "week", "genre")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vocab (
+    id   INTEGER PRIMARY KEY,
+    word TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id        INTEGER PRIMARY KEY,
+    key       TEXT NOT NULL UNIQUE,
+    title     TEXT NOT NULL DEFAULT '',
+    student   TEXT NOT NULL DEFAULT '',
+    week      TEXT NOT NULL DEFAULT '',
+    genre     TEXT NOT NULL DEFAULT '',
+    added     TEXT NOT NULL,
+    words     INTEGER NOT NULL,
+    sentences INTEGER NOT NULL,
+    chars     INTEGER NOT NULL,
+    text      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tokens (
+    doc_id    INTEGER PRIMARY KEY REFERENCES documents(id) ON DELETE CASCADE,
+    word_ids  BLOB NOT NULL,   -- int32 vocab IDs of WORD_RE tokens
+    alpha_ids BLOB NOT NULL    -- int32 vocab IDs of ALPHA_WORD_RE tokens
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, text, content='documents', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts(rowid, title, text) VALUES (new.id, new.title, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+END;
+"""
+
+
+def _blob(ids: list[int]) -> bytes:
+    return np.asarray(ids, dtype=np.int32).tobytes()
+
+def _ids(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.int32)
+
+
+@dataclass(frozen=True)
+class WorkspaceSubset:
+    """Saved documents loaded as integer codes (local, dense vocabulary)."""
+    key: str
+    doc_ids: tuple
+    vocab: np.ndarray        # local ID -> word
+    word_ids: np.ndarray     # WORD_RE tokens as local IDs, documents in doc_ids order
+    alpha_ids: np.ndarray    # ALPHA_WORD_RE tokens as local IDs
+    word_count: int
+    sentence_count: int
+    char_count: int
+    doc_words: tuple         # WORD_RE tokens per document, in doc_ids order
+    approximate: bool = False
+
+    @property
+    def documents(self) -> int:
+        return len(self.doc_ids)
+
+    @property
+    def alpha_token_count(self) -> int:
+        return int(self.alpha_ids.size)
+
+    @property
+    def word_codes(self) -> tuple:
+        return self.word_ids, self.vocab
+
+    @property
+    def alpha_codes(self) -> tuple:
+        return self.alpha_ids, self.vocab
+
+    @cached_property
+    def word_table(self) -> FrequencyTable:
+        return FrequencyTable.from_codes(self.word_ids, self.vocab)
+
+    @cached_property
+    def alpha_table(self) -> FrequencyTable:
+        return FrequencyTable.from_codes(self.alpha_ids, self.vocab)
+
+    @cached_property
+    def alpha_counts(self) -> Counter:
+        t = self.alpha_table
+        return Counter(dict(zip(t.words.tolist(), t.counts.tolist())))
+
+    @cached_property
+    def features(self) -> ReadabilityFeatures:
+        return features_from_counts(self.alpha_counts, self.sentence_count)
+
+
+class Workspace:
+    """One SQLite file; safe to share across Streamlit sessions (one lock per workspace)."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._version = 0
+        self._subsets = LRUCache(16)
+
+    # ---- vocabulary ----
+    def _word_ids(self, words: list[str]) -> dict:
+        """word -> global ID, inserting new words (caller holds the lock)."""
+        uniq = list(dict.fromkeys(words))
+        self._conn.executemany("INSERT OR IGNORE INTO vocab(word) VALUES (?)", ((w,) for w in uniq))
+        ids = {}
+        for start in range(0, len(uniq), 900):  # stay under SQLite's parameter limit
+            part = uniq[start:start + 900]
+            marks = ",".join("?" * len(part))
+            ids.update(self._conn.execute(f"SELECT word, id FROM vocab WHERE word IN ({marks})", part))
+        return ids
+
+    # ---- writing ----
+    def add_document(self, text: str, **meta) -> tuple[int, bool]:
+        """Save a text (metadata: title, student, week, genre). Returns (doc ID, newly added)."""
+        key = text_key(text)
+        lowered = text.lower()
+        words = WORD_RE.findall(lowered)
+        alpha = ALPHA_WORD_RE.findall(lowered)
+        fields = {c: str(meta.get(c) or "").strip() for c in META_COLUMNS}
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM documents WHERE key = ?", (key,)).fetchone()
+            if row:
+                return row[0], False
+            ids = self._word_ids(words + alpha)
+            cur = self._conn.execute(
+                "INSERT INTO documents(key, title, student, week, genre, added, words, sentences, chars, text) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, fields["title"], fields["student"], fields["week"], fields["genre"],
+                 datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                 len(words), count_sentences(text), len(text), text),
+            )
+            doc_id = cur.lastrowid
+            self._conn.execute(
+                "INSERT INTO tokens(doc_id, word_ids, alpha_ids) VALUES (?, ?, ?)",
+                (doc_id, _blob([ids[w] for w in words]), _blob([ids[w] for w in alpha])),
+            )
+            self._version += 1
+        return doc_id, True
+
+    def add_documents(self, documents: Iterable[tuple[str, str]], **meta) -> int:
+        """(title, text) pairs with shared metadata; returns how many were new."""
+        return sum(self.add_document(text, **{**meta, "title": title})[1] for title, text in documents)
+
+    def delete_documents(self, doc_ids: Iterable[int]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM documents WHERE id = ?", ((int(i),) for i in doc_ids))
+            self._version += 1
+
+    # ---- reading ----
+    def documents(self, **filters) -> pd.DataFrame:
+        """
+        Document list; filters are metadata columns -> allowed values
+        (e.g. week=["3", "4"]); empty or missing filters match everything.
+        """
+        where, params = [], []
+        for col in META_COLUMNS:
+            values = filters.get(col)
+            if values:
+                where.append(f"{col} IN ({','.join('?' * len(values))})")
+                params.extend(values)
+        sql = "SELECT id, title, student, week, genre, words, sentences, added FROM documents"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self._lock:
+            return pd.read_sql_query(sql + " ORDER BY id", self._conn, params=params)
+
+    def facets(self, column: str) -> list[str]:
+        if column not in META_COLUMNS:
+            raise ValueError(f"unknown column: {column}")
+        with self._lock:
+            rows = self._conn.execute(f"SELECT DISTINCT {column} FROM documents WHERE {column} != '' ORDER BY 1")
+            return [r[0] for r in rows]
+
+    def search(self, query: str, limit: int = 200) -> pd.DataFrame:
+        """FTS5 search (words, "phrases", prefix*, AND/OR/NOT) with a highlighted snippet."""
+        sql = (
+            "SELECT d.id, d.title, d.student, d.week, d.genre, "
+            "snippet(documents_fts, 1, '**', '**', ' … ', 12) AS snippet "
+            "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+            "WHERE documents_fts MATCH ? ORDER BY rank LIMIT ?"
+        )
+        with self._lock:
+            try:
+                return pd.read_sql_query(sql, self._conn, params=(query, limit))
+            except (sqlite3.OperationalError, pd.errors.DatabaseError) as e:
+                raise ValueError(f"search query not understood: {query!r}") from e
+
+    def iter_texts(self, doc_ids: Iterable[int]) -> Iterator[str]:
+        for doc_id in doc_ids:
+            with self._lock:
+                row = self._conn.execute("SELECT text FROM documents WHERE id = ?", (int(doc_id),)).fetchone()
+            if row:
+                yield row[0]
+
+    def subset(self, doc_ids: Iterable[int]) -> WorkspaceSubset:
+        """Load saved documents as integer codes (cached until the workspace changes)."""
+        doc_ids = tuple(sorted(int(i) for i in doc_ids))
+        cache_key = (self._version, doc_ids)
+        subset = self._subsets.get(cache_key)
+        if subset is not None:
+            return subset
+
+        marks = ",".join("?" * len(doc_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT t.word_ids, t.alpha_ids, d.words, d.sentences, d.chars "
+                f"FROM tokens t JOIN documents d ON d.id = t.doc_id WHERE t.doc_id IN ({marks}) ORDER BY t.doc_id",
+                doc_ids,
+            ).fetchall() if doc_ids else []
+        word_ids = np.concatenate([_ids(r[0]) for r in rows]) if rows else np.array([], dtype=np.int32)
+        alpha_ids = np.concatenate([_ids(r[1]) for r in rows]) if rows else np.array([], dtype=np.int32)
+
+        # re-number the global IDs densely for this subset
+        used, inverse = np.unique(np.concatenate([word_ids, alpha_ids]), return_inverse=True)
+        with self._lock:
+            lookup = dict(self._conn.execute(
+                f"SELECT id, word FROM vocab WHERE id IN ({','.join(map(str, used.tolist()))})"
+            )) if used.size else {}
+        vocab = np.array([lookup[i] for i in used.tolist()], dtype=str) if used.size else np.array([], dtype="U1")
+        inverse = inverse.astype(np.int32)
+
+        subset = WorkspaceSubset(
+            key=f"workspace:{text_key(self.path + repr(cache_key))}",
+            doc_ids=doc_ids,
+            vocab=vocab,
+            word_ids=inverse[:word_ids.size],
+            alpha_ids=inverse[word_ids.size:],
+            word_count=sum(r[2] for r in rows),
+            sentence_count=sum(r[3] for r in rows),
+            char_count=sum(r[4] for r in rows),
+            doc_words=tuple(r[2] for r in rows),
+        )
+        self._subsets.put(cache_key, subset)
+        return subset
+
+
+_workspaces: dict = {}
+_workspaces_lock = threading.Lock()
+
+def open_workspace(path: str = DEFAULT_PATH) -> Workspace:
+    """One shared Workspace per file (connections are reused across reruns and sessions)."""
+    with _workspaces_lock:
+        if path not in _workspaces:
+            _workspaces[path] = Workspace(path)
+        return _workspaces[path]